@@ -0,0 +1,225 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from inspect            import iscoroutinefunction, isasyncgenfunction, isasyncgen, unwrap
+from contextvars        import copy_context
+import io, sys, asyncio
+
+class ASGIApp:
+    def __init__(self, app, threads = None):
+        self.app  = app
+        self.pool = ThreadPoolExecutor(threads)
+
+    async def __call__(self, scope, receive, send):
+        match scope["type"]:
+            case "http":
+                await self.__http(scope, receive, send)
+            case "lifespan":
+                await self.__lifespan(receive, send)
+
+    async def __lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            match message["type"]:
+                case "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                case "lifespan.shutdown":
+                    self.pool.shutdown(wait = False)
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+    def __environ(self, scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        root   = scope.get("root_path", "")
+        path   = scope["path"]
+
+        if path.startswith(root):
+            path = path[len(root):]
+
+        environ = {
+            "REQUEST_METHOD":    scope["method"],
+            "SCRIPT_NAME":       root.encode().decode("latin-1"),
+            "PATH_INFO":         path.encode().decode("latin-1"),
+            "QUERY_STRING":      scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME":       str(server[0]),
+            "SERVER_PORT":       str(server[1]),
+            "REMOTE_ADDR":       str(client[0]),
+            "REMOTE_PORT":       str(client[1]),
+            "SERVER_PROTOCOL":   "HTTP/" + scope.get("http_version", "1.1"),
+            "wsgi.version":      (1, 0),
+            "wsgi.url_scheme":   scope.get("scheme", "http"),
+            "wsgi.input":        io.BytesIO(body),
+            "wsgi.errors":       sys.stderr,
+            "wsgi.multithread":  True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once":     False
+        }
+
+        for name, value in scope.get("headers", []):
+            name  = name.decode("latin-1")
+            value = value.decode("latin-1")
+
+            match name:
+                case "content-type":
+                    key = "CONTENT_TYPE"
+                case "content-length":
+                    key = "CONTENT_LENGTH"
+                case _:
+                    key = "HTTP_" + name.upper().replace("-", "_")
+
+            if key in environ:
+                value = environ[key] + "," + value
+
+            environ[key] = value
+
+        return environ
+
+    def __view(self, environ):
+        try:
+            endpoint, _ = self.app.url_map.bind_to_environ(environ).match()
+        except Exception:
+            return None
+
+        view = unwrap(self.app.view_functions.get(endpoint, lambda: None))
+
+        if iscoroutinefunction(view) or isasyncgenfunction(view):
+            return view
+
+        return None
+
+    def __wsgi(self, environ):
+        started = []
+
+        def startResponse(status, headers, excInfo = None):
+            started[:] = [status, headers]
+
+        result = self.app.wsgi_app(environ, startResponse)
+        return int(started[0].split(" ", 1)[0]), started[1], result
+
+    async def __threaded(self, environ):
+        loop    = asyncio.get_running_loop()
+        context = copy_context()
+
+        status, headers, result = await loop.run_in_executor(self.pool, context.run, self.__wsgi, environ)
+        chunks = iter(result)
+
+        try:
+            yield status, headers
+
+            while True:
+                chunk = await loop.run_in_executor(self.pool, context.run, next, chunks, None)
+                if chunk is None:
+                    break
+
+                if len(chunk) != 0:
+                    yield chunk
+        finally:
+            if hasattr(result, "close"):
+                await loop.run_in_executor(self.pool, context.run, result.close)
+
+    async def __dispatch(self, environ, view):
+        app    = self.app
+        ctx    = app.request_context(environ)
+        error  = None
+        stream = None
+
+        ctx.push()
+
+        try:
+            try:
+                try:
+                    result = app.preprocess_request()
+
+                    if result is None:
+                        result = view(**ctx.request.view_args)
+
+                        if isasyncgen(result):
+                            stream = result
+                            result = app.response_class()
+                        else:
+                            result = await result
+                except Exception as e:
+                    result = app.handle_user_exception(e)
+
+                response = app.finalize_request(result)
+            except Exception as e:
+                error    = e
+                response = app.handle_exception(e)
+
+            yield response.status_code, response.headers.to_wsgi_list()
+
+            if stream is not None:
+                async for chunk in stream:
+                    if len(chunk) != 0:
+                        yield chunk.encode() if isinstance(chunk, str) else chunk
+            else:
+                for chunk in response.get_app_iter(environ):
+                    if len(chunk) != 0:
+                        yield chunk
+
+            response.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if stream is not None:
+                await stream.aclose()
+
+            ctx.pop(error)
+
+    async def __http(self, scope, receive, send):
+        chunks = []
+        while True:
+            message = await receive()
+
+            if message["type"] == "http.disconnect":
+                return
+
+            chunks.append(message.get("body", b""))
+
+            if not message.get("more_body", False):
+                break
+
+        environ  = self.__environ(scope, b"".join(chunks))
+        view     = self.__view(environ)
+        response = self.__threaded(environ) if view is None else self.__dispatch(environ, view)
+
+        try:
+            status, headers = await anext(response)
+
+            await send({
+                "type":    "http.response.start",
+                "status":  status,
+                "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+            })
+
+            async for chunk in response:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            await response.aclose()
+
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,119 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# measures render time and peak memory of row loops with each render buffer backend, with rows
+# echoed both directly from the entry point and from a nested qinp! function whose result is
+# echoed in turn. every backend must render the same page. a backend that takes longer than
+# LIMIT seconds is skipped for the larger row counts of the same loop
+
+import os, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qinp import Compiler, RENDER_BUFFERS
+
+LIMIT = 5
+
+LOOPS = {
+    "direct": '''
+        for i in range(rows) {
+            echo "<tr><td>" + str(i) + "</td><td>row</td></tr>";
+        }
+    ''',
+    "nested": '''
+        row(i) {
+            echo "<tr><td>" + str(i) + "</td>";
+            return "<td>row</td></tr>";
+        }
+
+        for i in range(rows) {
+            echo row(i);
+        }
+    '''
+}
+
+def build(loop, buffer, rows):
+    compiler = Compiler(buffer = buffer)
+
+    compiler.static("<html><body><table>")
+    compiler.compile(LOOPS[loop])
+    compiler.static("</table></body></html>")
+    compiler.finish()
+
+    namespace = {"rows": rows}
+    exec(compiler.build("buffer.qinp"), namespace)
+    return namespace["qinpEntryPoint0"]
+
+def render(entryPoint):
+    return entryPoint().encode()
+
+def run(loop, rows, slow, repeat = 3):
+    line   = f"{loop:6s} | {rows:8d} rows"
+    output = None
+
+    for buffer in RENDER_BUFFERS:
+        if buffer in slow:
+            line += f" | {buffer:4s} {'skipped':>24s}"
+            continue
+
+        entryPoint = build(loop, buffer, rows)
+        page       = render(entryPoint)
+
+        if output is None:
+            output = page
+        elif page != output:
+            raise RuntimeError(f"the {buffer} buffer renders a different page for the {loop} loop")
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render(entryPoint)
+            end = time.perf_counter() - start
+
+            if best is None or end < best:
+                best = end
+
+            if end > LIMIT:
+                slow.add(buffer)
+                break
+
+        if buffer in slow:
+            line += f" | {buffer:4s} {best * 1e3:9.3f} ms {'-':>8s} MB"
+            continue
+
+        tracemalloc.start()
+        render(entryPoint)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        line += f" | {buffer:4s} {best * 1e3:9.3f} ms {peak / 1024 / 1024:8.2f} MB"
+
+    print(line)
+
+if __name__ == "__main__":
+    for loop in LOOPS:
+        slow = set()
+
+        for rows in (sys.argv[1:] or (10000, 100000, 1000000)):
+            run(loop, int(rows), slow)
@@ -0,0 +1,239 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# times each stage of the qinp! pipeline (HTML parsing, tokenizing, code generation, bytecode compilation
+# and execution) on synthetic pages of varying size, nesting depth, statement mix and static HTML ratio
+
+import os, sys, time, json, platform, argparse, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qinp import Compiler, Tokens
+from pinq import CustomHTMLParser
+
+STATEMENTS = {
+    "for":   "for i{n} in range(1) {{\n{body}\n}}",
+    "do":    "k{n} = 0;\ndo {{\n{body}\nk{n} += 1;\n}} while k{n} < 1;",
+    "match": 'match x {{\ncase -1 {{ echo "never"; }}\ndefault {{\n{body}\n}}\n}}',
+    "class": "class C{n} {{\nnew!(a) {{ this.a = a; }}\nget() {{\n{body}\nreturn this.a;\n}}\n}}",
+    "enum":  "enum E{n} {{ A{n}, B{n}, C{n} = 5 }}\n{body}",
+    "query": 'report{n}() {{\nMySQL "localhost", "user", "password" {{\nquery (rows{n}) x {{ SELECT * FROM t{n} WHERE id = %s; }}\n}}\n{body}\n}}'
+}
+
+LEAF   = 'echo "<td>" + str(x) + "</td>";\necho "<p>static row</p>";'
+STATIC = '<div class="row"><span>some static text between blocks</span></div>\n'
+
+class Recorder(CustomHTMLParser):
+    def __init__(self):
+        self.segments = []
+        super().__init__()
+
+    def updateHtmlBuf(self):
+        self.segments.append(("".join(self.buf), None))
+
+    def compileBlock(self, text, line):
+        self.segments.append((text, line))
+
+    def reset(self):
+        self.segments = []
+        super().reset()
+
+def statement(mix, level, depth, counter):
+    counter[0] += 1
+    n = counter[0]
+
+    if depth == 0:
+        return LEAF
+
+    body = statement(mix, level + 1, depth - 1, counter)
+    return STATEMENTS[mix[level % len(mix)]].format(n = n, body = body)
+
+def generate(blocks, depth, mix, ratio):
+    counter = [0]
+    page    = ["<html>\n<body>\n"]
+
+    for i in range(blocks):
+        code = f"x = {i};\n" + "\n".join(statement(mix[j:] + mix[:j], 0, depth, counter) for j in range(len(mix)))
+
+        if ratio > 0:
+            page.append(STATIC * max(1, round(len(code) * ratio / (1 - ratio) / len(STATIC))))
+
+        page.append(f"<qinp!>\n{code}\n</qinp!>\n")
+
+    page.append("</body>\n</html>\n")
+    return "".join(page)
+
+def parse(source):
+    parser = Recorder()
+    parser.feed(source)
+
+    if len(parser.buf) != 0:
+        parser.updateHtmlBuf()
+
+    return parser.segments
+
+def tokenize(segments):
+    return [(text if line is None else Tokens(text).store, line) for text, line in segments]
+
+def codegen(segments, options):
+    compiler = Compiler(**options)
+
+    for section, line in segments:
+        if line is None:
+            compiler.static(section)
+        else:
+            compiler.compile(section, line)
+
+    compiler.finish()
+    return compiler
+
+def build(compiler):
+    return compiler.build("benchmark.qinp")
+
+def execute(code):
+    namespace = {"escape": str}
+    exec(code, namespace)
+
+    for name, value in namespace.items():
+        if name.startswith("qinpEntryPoint"):
+            return value()
+
+def measure(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start  = time.perf_counter()
+        result = fn()
+        end    = time.perf_counter() - start
+
+        if best is None or end < best:
+            best = end
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, best, peak
+
+def run(name, blocks, depth, mix, ratio, options, repeat):
+    source = generate(blocks, depth, mix, ratio)
+    size   = len(source.encode()) / 1024
+
+    segments, parseTime,    parsePeak    = measure(lambda: parse(source), repeat)
+    stores,   tokenizeTime, tokenizePeak = measure(lambda: tokenize(segments), repeat)
+    compiler, codegenTime,  codegenPeak  = measure(lambda: codegen(stores, options), repeat)
+
+    if compiler.hadError:
+        compiler.render()
+        raise RuntimeError(f"{name}: generated source failed to compile")
+
+    code, buildTime, buildPeak = measure(lambda: build(compiler), repeat)
+    tokens = sum(len(store) for store, line in stores if line is not None)
+
+    result = {
+        "name": name, "blocks": blocks, "depth": depth, "mix": mix, "ratio": ratio,
+        "size": size, "tokens": tokens, "stages": {}
+    }
+
+    stages = [
+        ("parse",    parseTime,    parsePeak),
+        ("tokenize", tokenizeTime, tokenizePeak),
+        ("codegen",  codegenTime,  codegenPeak),
+        ("build",    buildTime,    buildPeak)
+    ]
+
+    try:
+        _, execTime, execPeak = measure(lambda: execute(code), repeat)
+        stages.append(("exec", execTime, execPeak))
+    except ImportError as e:
+        result["stages"]["exec"] = {"skipped": str(e)}
+
+    for stage, seconds, peak in stages:
+        result["stages"][stage] = {
+            "seconds": seconds, "kbPerSecond": size / seconds, "tokensPerSecond": tokens / seconds, "peakBytes": peak
+        }
+
+    line = f"{name:24s} | {size:9.1f} KB | {tokens:8d} tokens"
+    for stage in ("parse", "tokenize", "codegen", "build", "exec"):
+        if "seconds" in result["stages"][stage]:
+            line += f" | {stage} {result['stages'][stage]['seconds'] * 1e3:9.3f} ms"
+        else:
+            line += f" | {stage} {'skipped':>12s}"
+
+    print(line)
+    return result
+
+def suite(scale):
+    mix = [kind for kind in STATEMENTS if kind != "query"]
+
+    for blocks in (4, 16, 64):
+        yield f"size-{blocks * scale}", blocks * scale, 2, mix, 0.5
+
+    for depth in (1, 4, 8):
+        yield f"depth-{depth}", 4 * scale, depth, mix, 0.5
+
+    for kind in STATEMENTS:
+        yield f"mix-{kind}", 8 * scale, 3, [kind], 0.5
+
+    for ratio in (0.0, 0.5, 0.9):
+        yield f"ratio-{ratio}", 8 * scale, 2, mix, ratio
+
+def compare(results, path):
+    with open(path, "r") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    for result in results:
+        if result["name"] not in baseline:
+            continue
+
+        line = f"{result['name']:24s}"
+        for stage, data in result["stages"].items():
+            old = baseline[result["name"]]["stages"].get(stage, {})
+
+            if "seconds" in data and "seconds" in old:
+                line += f" | {stage} {old['seconds'] / data['seconds']:5.2f}x"
+
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "qinp! compiler benchmark suite")
+    parser.add_argument("--output",   default = "compiler.json", help = "where to write the JSON results")
+    parser.add_argument("--baseline", help = "previous JSON results to compare against")
+    parser.add_argument("--scale",    type = int, default = 1, help = "multiplies the number of blocks of every case")
+    parser.add_argument("--repeat",   type = int, default = 5)
+    parser.add_argument("--fusion",   action = "store_true")
+    parser.add_argument("--hoist",    action = "store_true")
+    args = parser.parse_args()
+
+    options = {"fusion": args.fusion, "hoist": args.hoist}
+    results = [run(*case, options, args.repeat) for case in suite(args.scale)]
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "python": platform.python_version(), "platform": platform.platform(),
+            "time": time.time(), "options": options, "repeat": args.repeat, "results": results
+        }, f, indent = 4)
+
+    if args.baseline is not None:
+        compare(results, args.baseline)
@@ -0,0 +1,79 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# compares generated code size and compile time of the sample pages with the legacy \uXXXX literal encoding
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import qinp
+from pinq import CustomHTMLParser
+
+def legacy(buffer):
+    return "'" + "".join(map(lambda char: rf"\u{ord(char):04x}", buffer)) + "'"
+
+def generate(path):
+    with open(path, "r") as source:
+        content = source.read()
+
+    parser = CustomHTMLParser()
+    parser.feed(content)
+
+    if len(parser.buf) != 0:
+        parser.updateHtmlBuf()
+
+    parser.compiler.finish()
+    return parser.compiler.headers.getvalue() + parser.compiler.out.getvalue()
+
+def measure(path, encoder, repeat):
+    qinp.encode = encoder
+    code = generate(path)
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compile(code, path, "exec")
+        end = time.perf_counter() - start
+
+        if best is None or end < best:
+            best = end
+
+    return len(code), best
+
+def run(path, repeat = 200):
+    encoder = qinp.encode
+
+    oldSize, oldTime = measure(path, legacy, repeat)
+    newSize, newTime = measure(path, encoder, repeat)
+
+    qinp.encode = encoder
+    print(f"{os.path.basename(path):28s} | legacy {oldSize:7d} B {oldTime * 1e3:7.3f} ms | repr {newSize:7d} B {newTime * 1e3:7.3f} ms | {oldSize / newSize:5.2f}x smaller, {oldTime / newTime:5.2f}x faster")
+
+if __name__ == "__main__":
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+    paths  = sys.argv[1:] or [os.path.join(source, f) for f in sorted(os.listdir(source)) if f.endswith((".html", ".htm", ".qinp"))]
+
+    for path in paths:
+        run(os.path.abspath(path))
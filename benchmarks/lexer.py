@@ -0,0 +1,68 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# measures qinp! tokenizer throughput on large synthetic sources
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qinp import Tokens
+
+SNIPPET = '''
+for i in range(10) {
+    if i % 2 == 0 { continue; } # skip even rows
+    echo f"<tr><td>{i}</td><td>{i ** 2}</td></tr>";
+}
+
+class Row : Base {
+    new!(a, b) { this.a = a; this.b = b; }
+    operator![+](other) { return Row(this.a + other.a, this.b + other.b); }
+}
+
+x //= 2; y <<= 1; z **= 3; w != q;
+echo """
+    <div class="static">some static content</div>
+""" % ();
+echo r'raw \\d+' + b"bytes".decode();
+'''
+
+def run(sizeMB, repeat = 3):
+    source = SNIPPET * max(1, int(sizeMB * 1024 * 1024) // len(SNIPPET))
+
+    best = None
+    for _ in range(repeat):
+        start  = time.perf_counter()
+        tokens = Tokens(source)
+        end    = time.perf_counter() - start
+
+        if best is None or end < best:
+            best = end
+
+    count = len(tokens.tokens)
+    print(f"{len(source) / 1048576:8.2f} MB | {count:9d} tokens | {best:7.3f} s | {count / best:12.0f} tokens/s | {len(source) / 1048576 / best:7.2f} MB/s")
+
+if __name__ == "__main__":
+    for size in (sys.argv[1:] or (1, 4, 16)):
+        run(float(size))
@@ -0,0 +1,87 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# measures per-request render time of straight-line pages with and without fusion
+
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qinp import Compiler
+
+STATIC = '''
+    <div class="card">
+        <h2>static heading</h2>
+        <p>some static paragraph text that does not change between requests</p>
+    </div>
+'''
+
+BLOCK = '''
+    echo f"<p>Time: {now}</p>";
+    echo f"<div>Random number: {number}</div><br>";
+    echo escape(request);
+'''
+
+def build(blocks, fusion):
+    compiler = Compiler(fusion = fusion)
+
+    for _ in range(blocks):
+        compiler.static(STATIC)
+        compiler.compile(BLOCK)
+
+    compiler.static(STATIC)
+    compiler.finish()
+
+    namespace = {"now": "12:00:00", "number": 4, "request": "GET /", "escape": str}
+    exec(compiler.build("render.qinp"), namespace)
+    entryPoint = namespace["qinpEntryPoint0"]
+    code       = entryPoint.__code__
+
+    if fusion and "_HTML_BUF" in code.co_varnames + code.co_cellvars:
+        raise RuntimeError("fusion did not apply to the benchmark page")
+
+    return entryPoint
+
+def run(blocks, requests = 100000, repeat = 3):
+    times = []
+    for fusion in (False, True):
+        entryPoint = build(blocks, fusion)
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(requests):
+                entryPoint()
+            end = time.perf_counter() - start
+
+            if best is None or end < best:
+                best = end
+
+        times.append(best / requests * 1e6)
+
+    print(f"{blocks:4d} blocks | unfused {times[0]:8.3f} us/request | fused {times[1]:8.3f} us/request | {times[0] / times[1]:5.2f}x")
+
+if __name__ == "__main__":
+    for blocks in (sys.argv[1:] or (1, 4, 16, 64)):
+        run(int(blocks))
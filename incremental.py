@@ -0,0 +1,164 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from pinq import CustomHTMLParser
+from qinp import Tokens
+from time import perf_counter
+
+class Block:
+    __slots__ = ("store", "unit")
+
+    def __init__(self, store, unit):
+        self.store = store
+        self.unit  = unit
+
+class EditReport:
+    __slots__ = ("lex", "compile", "link", "build", "total", "relexed", "recompiled", "reused")
+
+    def __init__(self):
+        self.lex        = 0.0
+        self.compile    = 0.0
+        self.link       = 0.0
+        self.build      = 0.0
+        self.total      = 0.0
+        self.relexed    = 0
+        self.recompiled = 0
+        self.reused     = 0
+
+    def __str__(self):
+        return (
+            f"{self.total * 1000:.3f} ms (lex {self.lex * 1000:.3f} ms, compile {self.compile * 1000:.3f} ms, "
+            f"link {self.link * 1000:.3f} ms, build {self.build * 1000:.3f} ms), "
+            f"{self.relexed} relexed, {self.recompiled} recompiled, {self.reused} reused"
+        )
+
+class DocumentParser(CustomHTMLParser):
+    def __init__(self, document, **options):
+        self.document = document
+        super().__init__(**options)
+
+    def compileBlock(self, text, line):
+        self.document.block(text, line)
+
+class Document:
+    def __init__(self, text = "", fileName = "<document>", **options):
+        options.setdefault("production", True)
+
+        self.fileName    = fileName
+        self.text        = ""
+        self.parser      = DocumentParser(self, **options)
+        self.blocks      = []
+        self.route       = None
+        self.code        = None
+        self.buildError  = None
+        self.hadError    = False
+        self.diagnostics = []
+
+        self.__report = None
+        self.__old    = []
+        self.__cache  = {}
+
+        self.update(text)
+
+    @property
+    def compiler(self):
+        return self.parser.compiler
+
+    def block(self, text, line):
+        cached = self.__cache.get(text)
+
+        if cached is None:
+            index = len(self.blocks)
+            begin = perf_counter()
+
+            if index < len(self.__old):
+                store = Tokens.relex(self.__old[index].store, text)
+            else:
+                store = Tokens(text).store
+
+            lexed = perf_counter()
+            cached = Block(store, self.compiler.unit(store, line))
+            self.__cache[text] = cached
+
+            self.__report.lex     += lexed - begin
+            self.__report.compile += perf_counter() - lexed
+            self.__report.relexed    += 1
+            self.__report.recompiled += 1
+        else:
+            self.__report.reused += 1
+
+        self.blocks.append(cached)
+        self.compiler.link(cached.unit, line)
+
+    def edit(self, start, end, text):
+        return self.update(self.text[:start] + text + self.text[end:])
+
+    def update(self, text):
+        begin  = perf_counter()
+        report = EditReport()
+
+        self.__report = report
+        self.__old    = self.blocks
+        self.__cache  = {block.store.source: block for block in self.blocks}
+        self.blocks   = []
+        self.text     = text
+
+        self.parser.reset()
+        self.parser.feed(text)
+
+        if len(self.parser.buf) != 0:
+            self.parser.updateHtmlBuf()
+
+        self.compiler.finish()
+        report.link = perf_counter() - begin - report.lex - report.compile
+
+        self.route       = self.parser.route
+        self.hadError    = self.compiler.hadError
+        self.diagnostics = self.compiler.diagnostics
+
+        self.code       = None
+        self.buildError = None
+
+        if not self.hadError:
+            linked = perf_counter()
+
+            try:
+                self.code = self.compiler.build(self.fileName)
+            except SyntaxError as e:
+                self.hadError   = True
+                self.buildError = e
+
+            report.build = perf_counter() - linked
+
+        self.__old   = []
+        self.__cache = {}
+
+        report.total = perf_counter() - begin
+        return report
+
+    def render(self):
+        self.compiler.render()
+
+        if self.buildError is not None:
+            print(f"{self.buildError.__class__.__name__}: {self.buildError}")
@@ -22,129 +22,398 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from qinp        import Compiler, encode
-from json        import load
+from qinp        import Compiler, VERSION
+from prefork     import Master
+from asgi        import ASGIApp
+from json        import load, dump
+from hashlib     import sha256
+from importlib   import util
 from flask       import *
 from pathlib     import Path
 from html.parser import HTMLParser
+from concurrent  import futures
+from threading   import Lock, Thread
+from functools   import wraps
+from inspect     import iscoroutinefunction, isgeneratorfunction, isasyncgenfunction
 from markupsafe  import escape as _escape
-import os
+import os, sys, time, shutil, marshal, asyncio
 
 HTTP_METHODS = ['GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'CONNECT', 'OPTIONS', 'TRACE', 'PATCH']
 
-os.chdir(str(Path(__file__).parent.absolute()))
+def compilerDigest():
+    digest = sha256()
+    for file in (sys.modules[Compiler.__module__].__file__, __file__):
+        with open(file, "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+class CompileCache:
+    def __init__(self, directory, options):
+        self.directory = directory
+        self.salt      = repr((VERSION, util.MAGIC_NUMBER, compilerDigest(), sorted(options.items()))).encode()
+
+        os.makedirs(directory, exist_ok = True)
+
+    def __prefix(self, path):
+        return sha256(path.encode()).hexdigest()[:16] + "."
+
+    def __file(self, path, source):
+        key = sha256(self.salt)
+        key.update(path.encode())
+        key.update(b"\0")
+        key.update(source.encode())
+
+        return os.path.join(self.directory, self.__prefix(path) + key.hexdigest() + ".qinpc")
+
+    def __prune(self, path, keep):
+        prefix = self.__prefix(path)
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            file = os.path.join(self.directory, name)
+
+            if name.startswith(prefix) and name.endswith(".qinpc") and file != keep:
+                try:
+                    os.remove(file)
+                except OSError:
+                    pass
+
+    def load(self, path, source):
+        try:
+            with open(self.__file(path, source), "rb") as f:
+                route, entry, code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        return route, entry, code
+
+    def store(self, path, source, route, entry, code):
+        file = self.__file(path, source)
+        tmp  = f"{file}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp, "wb") as f:
+                marshal.dump((route, entry, code), f)
+
+            os.replace(tmp, file)
+        except OSError as e:
+            print(f"Couldn't write compile cache for {path}: {e}")
+            return
+
+        self.__prune(path, file)
 
 class CustomHTMLParser(HTMLParser):
-    def __init__(self):
+    def __init__(self, **options):
         self.compile    = False
-        self.first      = True
-        self.route      = False
-        self.compiler   = Compiler()
-        self.buf        = ""
-        self.compileBuf = ""
+        self.route      = None
+        self.compiler   = Compiler(**options)
+        self.buf        = []
+        self.compileBuf = []
+        self.blockLine  = 1
 
         super().__init__()
 
-    def __encodeBuffer(self):
-        return encode(self.buf)
-
     def updateHtmlBuf(self):
-        if self.first:
-            self.first = False
-            self.compiler.out += f"'{self.__encodeBuffer()}'\n"
-        else:
-            self.compiler.out += (" " * self.compiler.lastTabs) + f"_HTML_BUF+='{self.__encodeBuffer()}'\n"
+        self.compiler.static("".join(self.buf))
+
+    def compileBlock(self, text, line):
+        self.compiler.compile(text, line)
 
     def handle_starttag(self, tag, attrs):
         strAttrs = " ".join([f'{x[0]}="{x[1]}"' for x in attrs])
 
         if tag in ("qinp!", "qinp"):
             self.updateHtmlBuf()
-            if not self.route:
+            if self.route is None:
                 dictAttrs = {x[0]:x[1] for x in attrs}
                 if "route" in dictAttrs:
-                    self.route = True
-                    self.compiler.out = f'@pinq.route("{dictAttrs["route"]}",methods=HTTP_METHODS)\n' + self.compiler.out
+                    self.route = dictAttrs["route"]
 
-            self.buf = ""
-            self.compile = True
+            self.buf       = []
+            self.compile   = True
+            self.blockLine = self.getpos()[0]
         elif self.compile:
             if strAttrs == "":
-                self.compileBuf += f"<{tag}>"
+                self.compileBuf.append(f"<{tag}>")
             else:
-                self.compileBuf += f"<{tag} {strAttrs}>"
+                self.compileBuf.append(f"<{tag} {strAttrs}>")
         else:
             if strAttrs == "":
-                self.buf += f"<{tag}>"
+                self.buf.append(f"<{tag}>")
             else:
-                self.buf += f"<{tag} {strAttrs}>"
+                self.buf.append(f"<{tag} {strAttrs}>")
 
     def handle_endtag(self, tag):
         if tag in ("qinp!", "qinp"):
-            self.compiler.compile(self.compileBuf)
+            self.compileBlock("".join(self.compileBuf), self.blockLine)
             self.compile    = False
-            self.compileBuf = ""
+            self.compileBuf = []
         elif self.compile:
-            self.compileBuf += f"</{tag}>"
+            self.compileBuf.append(f"</{tag}>")
         else:
-            self.buf += f"</{tag}>"
+            self.buf.append(f"</{tag}>")
 
     def handle_data(self, data):
         if self.compile:
-            self.compileBuf += data
+            self.compileBuf.append(data)
         else:
-            self.buf += data.replace("\n", "")
+            data = data.replace("\n", "")
+
+            if data != "":
+                self.buf.append(data)
+
+    def compilePage(self, path, source, index, exports = False):
+        self.reset()
+        self.compiler.reset(index)
+        self.feed(source)
+
+        if len(self.buf) != 0:
+            self.updateHtmlBuf()
+
+        self.compiler.finish()
+
+        if self.compiler.hadError:
+            return None, self.compiler.diagnostics
+
+        if exports:
+            route, methods = pageRoute(path, self.route)
+            self.compiler.headers.line(0, f"QINP_ROUTE={route!r}")
+            self.compiler.headers.line(0, f"QINP_METHODS={methods!r}")
+            self.compiler.headers.line(0, f"QINP_ENTRY_POINT={self.compiler.entry!r}")
+
+        try:
+            code = self.compiler.build(path)
+        except SyntaxError as e:
+            self.compiler.syntaxError(e, source)
+            return None, self.compiler.diagnostics
+
+        return (self.route, self.compiler.entry, code), self.compiler.diagnostics
 
     def reset(self):
         self.compile    = False
-        self.first      = True
-        self.route      = False
-        self.buf        = ""
-        self.compileBuf = ""
+        self.route      = None
+        self.buf        = []
+        self.compileBuf = []
+        self.blockLine  = 1
         self.compiler.reset()
 
         super().reset()
 
-def escape(obj):
-    return str(_escape(str(obj)))
+def iterateAsync(generator):
+    loop = asyncio.new_event_loop()
+
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(generator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(generator.aclose())
+        loop.close()
+
+def installView(entry):
+    if isgeneratorfunction(entry):
+        @wraps(entry)
+        def view(*args, **kwargs):
+            return Response(stream_with_context(entry(*args, **kwargs)))
+    elif isasyncgenfunction(entry):
+        @wraps(entry)
+        def view(*args, **kwargs):
+            return Response(stream_with_context(iterateAsync(entry(*args, **kwargs))))
+    elif iscoroutinefunction(entry):
+        @wraps(entry)
+        def view(*args, **kwargs):
+            return asyncio.run(entry(*args, **kwargs))
+    else:
+        return entry
+
+    return view
+
+class LazyPage:
+    def __init__(self, path, source, index, route, options, cache, runtime):
+        self.path    = path
+        self.source  = source
+        self.index   = index
+        self.route   = route
+        self.options = options
+        self.cache   = cache
+        self.runtime = runtime
+        self.view    = None
+        self.lock    = Lock()
+
+    def __failed(self, *args, **kwargs):
+        abort(500)
+
+    def __load(self):
+        print(f"Compiling {self.path}")
+
+        parser = CustomHTMLParser(**(self.options | {"profile": False}))
+        page, diagnostics = parser.compilePage(self.path, self.source, self.index)
+
+        if page is None or not self.options["production"]:
+            for diagnostic in diagnostics:
+                diagnostic.render()
+
+        if page is None:
+            return self.__failed
+
+        if self.cache is not None:
+            self.cache.store(self.path, self.source, *page)
+
+        explicit, entry, code = page
+
+        if explicit != self.route:
+            print(f"{self.path}'s route changed from {self.route} to {explicit}. restart pinq! to apply it.")
+
+        namespace = dict(self.runtime)
+        exec(code, namespace)
+        return installView(namespace[entry])
+
+    def __call__(self, *args, **kwargs):
+        if self.view is None:
+            with self.lock:
+                if self.view is None:
+                    self.view = self.__load()
+
+                    if current_app.view_functions.get(self.path) is self:
+                        current_app.view_functions[self.path] = self.view
+
+        return self.view(*args, **kwargs)
+
+class Watcher(Thread):
+    def __init__(self, app, runtime, options, cache, interval, pages, index):
+        super().__init__(daemon = True)
+
+        self.app      = app
+        self.runtime  = runtime
+        self.cache    = cache
+        self.interval = interval
+        self.pages    = pages
+        self.index    = index
+        self.options  = options
+        self.parser   = CustomHTMLParser(**(options | {"profile": False}))
+
+    def __removed(self, *args, **kwargs):
+        abort(404)
+
+    def __compile(self, path, source):
+        page, diagnostics = self.parser.compilePage(path, source, self.index)
+        self.index += 1
+
+        if page is None or not self.options["production"]:
+            for diagnostic in diagnostics:
+                diagnostic.render()
+
+        if page is None:
+            return None
+
+        if self.cache is not None:
+            self.cache.store(path, source, *page)
+
+        explicit, entry, code = page
+
+        namespace = dict(self.runtime)
+        exec(code, namespace)
+        return pageRoute(path, explicit), installView(namespace[entry])
+
+    def __swap(self, changes):
+        scratch = Flask(self.app.import_name, static_folder = None)
+        for path, route in changes.items():
+            if route is not None:
+                scratch.add_url_rule(route[0], path, methods = route[1])
 
-print("pinq! runtime v2023.4.19")
+        old   = self.app.url_map
+        rules = [rule.empty() for rule in old.iter_rules() if rule.endpoint not in changes]
+        rules.extend(rule.empty() for rule in scratch.url_map.iter_rules())
 
-if __name__ == "__main__":
-    parser = CustomHTMLParser()
-    pinq   = Flask("pinq! runtime")
-    error  = False
+        self.app.url_map = self.app.url_map_class(
+            rules,
+            default_subdomain = old.default_subdomain,
+            strict_slashes    = old.strict_slashes,
+            merge_slashes     = old.merge_slashes,
+            redirect_defaults = old.redirect_defaults,
+            converters        = old.converters,
+            sort_parameters   = old.sort_parameters,
+            sort_key          = old.sort_key,
+            host_matching     = old.host_matching
+        )
 
-    for f in os.listdir("source"):
-        path = os.path.join("source", f)
-        if os.path.isfile(path) and any((f.endswith(".html"), f.endswith(".htm"), f.endswith(".qinp"))):
-            print(f"Loading {path}")
-            with open(path, "r") as source:
-                toParse = source.read()
+        for path, route in changes.items():
+            if route is None:
+                self.app.view_functions[path] = self.__removed
 
-            parser.feed(toParse)
+    def poll(self):
+        found   = sourceFiles("source")
+        changes = {}
 
-            if parser.buf != "":
-                parser.updateHtmlBuf()
+        for path in found:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
 
-            parser.compiler.out += " return _HTML_BUF"
+            key   = (stat.st_mtime_ns, stat.st_size)
+            state = self.pages.get(path)
 
-            if not parser.route:
-                route = "/" + Path(f).as_posix()
-                print(f"{path}'s route was not found. assigning dummy route: {route}")
+            if state is not None and state[0] == key:
+                continue
 
-                if f.endswith(".qinp"):
-                    parser.compiler.headers += f'@pinq.route("{route}",methods=HTTP_METHODS)\n'
-                else:
-                    parser.compiler.headers += f'@pinq.route("{route}")\n'
+            try:
+                with open(path, "r") as source:
+                    source = source.read()
+            except OSError:
+                continue
 
-            if not parser.compiler.hadError:
-                exec(parser.compiler.headers + parser.compiler.out)
-            else:
-                error = True
+            digest = sha256(source.encode()).hexdigest()
+            route  = None if state is None else state[2]
+
+            if state is not None and state[1] == digest:
+                self.pages[path] = (key, digest, route)
+                continue
 
-            parser.reset()
+            print(f"Reloading {path}")
+            result = self.__compile(path, source)
 
+            if result is not None:
+                new, view = result
+                self.app.view_functions[path] = view
+
+                if new != route:
+                    changes[path] = new
+                    route = new
+
+            self.pages[path] = (key, digest, route)
+
+        for path in set(self.pages).difference(found):
+            print(f"Removing {path}")
+
+            if self.pages[path][2] is not None:
+                changes[path] = None
+
+            del self.pages[path]
+
+        if len(changes) != 0:
+            self.__swap(changes)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Hot reload failed: {e}")
+
+def escape(obj):
+    return str(_escape(str(obj)))
+
+def loadConfig():
     with open("config.json", "r") as f:
         conf = load(f)
 
@@ -156,5 +425,369 @@ if __name__ == "__main__":
         print("Invalid port in config.json! Using default.")
         conf["port"] = 8080
 
+    for option in ("fusion", "hoist", "production", "profile", "lazy", "asynchronous", "streaming"):
+        if not isinstance(conf.get(option), bool):
+            conf[option] = False
+
+    if not isinstance(conf.get("jobs"), int) or conf["jobs"] < 1:
+        conf["jobs"] = os.cpu_count() or 1
+
+    if not isinstance(conf.get("workers"), int) or conf["workers"] < 0:
+        conf["workers"] = 0
+
+    if not isinstance(conf.get("threads"), int) or conf["threads"] < 1:
+        conf["threads"] = None
+
+    if conf.get("server") not in ("wsgi", "asgi"):
+        conf["server"] = "wsgi"
+
+    if conf.get("buffer") not in ("str", "list", "io"):
+        conf["buffer"] = "str"
+
+    match conf.get("watch"):
+        case True:
+            conf["watch"] = 1
+        case int() | float() if conf["watch"] > 0:
+            pass
+        case _:
+            conf["watch"] = 0
+
+    for option, default in (("cache", "__qinpcache__"), ("build", "build")):
+        if option not in conf or not isinstance(conf[option], (str, type(None))):
+            conf[option] = default
+
+    return conf
+
+def compilerOptions(conf):
+    return {option: conf[option] for option in ("fusion", "hoist", "production", "profile", "asynchronous", "streaming", "buffer")}
+
+def buildOptions(options):
+    return {option: value for option, value in options.items() if option != "profile"}
+
+def sourceFiles(directory):
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+
+        for f in sorted(files):
+            if f.endswith((".html", ".htm", ".qinp")):
+                paths.append(os.path.join(root, f))
+
+    return paths
+
+def readSources(paths):
+    sources = []
+    for path in paths:
+        with open(path, "r") as source:
+            sources.append(source.read())
+
+    return sources
+
+class RouteScanner(HTMLParser):
+    class Found(Exception): pass
+
+    def __init__(self):
+        self.route = None
+
+        super().__init__()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("qinp!", "qinp"):
+            route = dict(attrs).get("route")
+
+            if route is not None:
+                self.route = route
+                raise RouteScanner.Found()
+
+def scanRoute(source):
+    scanner = RouteScanner()
+
+    try:
+        scanner.feed(source)
+    except RouteScanner.Found:
+        pass
+
+    return scanner.route
+
+def pageRoute(path, route):
+    if route is not None:
+        return route, HTTP_METHODS
+
+    route = "/" + Path(path).relative_to("source").as_posix()
+
+    if path.endswith(".qinp"):
+        return route, HTTP_METHODS
+
+    return route, None
+
+worker = None
+
+def initWorker(options):
+    global worker
+    worker = CustomHTMLParser(**(options | {"production": True, "profile": False}))
+
+def compileWorker(path, source, index, exports):
+    page, diagnostics = worker.compilePage(path, source, index, exports)
+
+    if page is not None:
+        route, entry, code = page
+        page = (route, entry, marshal.dumps(code))
+
+    return page, diagnostics
+
+def compileParallel(paths, sources, pending, options, jobs, exports = False):
+    compiled = {}
+
+    if jobs <= 1 or len(pending) <= 1 or options["profile"]:
+        return compiled
+
+    with futures.ProcessPoolExecutor(min(jobs, len(pending)), initializer = initWorker, initargs = (options,)) as pool:
+        results = pool.map(
+            compileWorker, [paths[index] for index in pending], [sources[index] for index in pending],
+            pending, [exports] * len(pending)
+        )
+
+        for index, (page, diagnostics) in zip(pending, results):
+            if page is not None:
+                route, entry, code = page
+                page = (route, entry, marshal.loads(code))
+
+            compiled[index] = (page, diagnostics)
+
+    return compiled
+
+def loadBuild(directory, options):
+    try:
+        with open(os.path.join(directory, "manifest.json"), "r") as f:
+            manifest = load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if (
+        manifest.get("version") != VERSION or manifest.get("magic") != util.MAGIC_NUMBER.hex() or
+        manifest.get("compiler") != compilerDigest() or manifest.get("options") != buildOptions(options)
+    ):
+        print(f"Ignoring prebuilt pages in {directory}: built with a different compiler or configuration.")
+        return {}
+
+    return {page["source"]: page for page in manifest["pages"]}
+
+def loadPrebuilt(directory, page):
+    try:
+        with open(os.path.join(directory, page["module"]), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if data[:4] != util.MAGIC_NUMBER:
+        return None
+
+    return page["route"], page["entry"], marshal.loads(data[16:])
+
+def buildPages(directory = None):
+    root      = Path(__file__).parent.absolute()
+    directory = os.path.join(root, "build") if directory is None else os.path.abspath(directory)
+    os.chdir(str(root))
+
+    conf     = loadConfig()
+    options  = compilerOptions(conf)
+    parser   = CustomHTMLParser(**options)
+    paths    = sourceFiles("source")
+    sources  = readSources(paths)
+    compiled = compileParallel(paths, sources, list(range(len(paths))), options, conf["jobs"], True)
+    staging  = f"{directory}.{os.getpid()}.tmp"
+    previous = f"{directory}.{os.getpid()}.old"
+    pages    = []
+    error    = False
+
+    shutil.rmtree(staging, ignore_errors = True)
+
+    try:
+        for index, path in enumerate(paths):
+            print(f"Building {path}")
+
+            if index in compiled:
+                page, diagnostics = compiled[index]
+            else:
+                page, diagnostics = parser.compilePage(path, sources[index], index, True)
+
+            if page is None or not conf["production"]:
+                for diagnostic in diagnostics:
+                    diagnostic.render()
+
+            if page is None:
+                error = True
+                continue
+
+            route, entry, code = page
+            relative = Path(path).relative_to("source")
+            module   = relative.with_name(relative.name.replace(".", "_") + ".pyc").as_posix()
+            target   = os.path.join(staging, module)
+
+            os.makedirs(os.path.dirname(target), exist_ok = True)
+            with open(target, "wb") as f:
+                f.write(util.MAGIC_NUMBER)
+                f.write((1).to_bytes(4, "little"))
+                f.write(util.source_hash(sources[index].encode()))
+                f.write(marshal.dumps(code))
+
+            pages.append({
+                "source": path, "module": module, "route": route, "entry": entry,
+                "sha256": sha256(sources[index].encode()).hexdigest()
+            })
+
+        if error:
+            print("Build failed.")
+            return 1
+
+        os.makedirs(staging, exist_ok = True)
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            dump({
+                "version": VERSION, "magic": util.MAGIC_NUMBER.hex(), "compiler": compilerDigest(),
+                "options": buildOptions(options), "pages": pages
+            }, f, indent = 4)
+
+        if os.path.exists(directory):
+            os.replace(directory, previous)
+
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            if os.path.exists(previous):
+                os.replace(previous, directory)
+
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors = True)
+
+    shutil.rmtree(previous, ignore_errors = True)
+    print(f"Built {len(pages)} pages into {directory}.")
+    return 0
+
+print("pinq! runtime v2023.4.19")
+
+if __name__ == "__main__":
+    os.chdir(str(Path(__file__).parent.absolute()))
+
+    conf    = loadConfig()
+    options = compilerOptions(conf)
+
+    pinq  = Flask("pinq! runtime")
+    error = False
+
+    runtime = dict(vars())
+
+    parser   = CustomHTMLParser(**options)
+    cache    = None if conf["cache"] is None else CompileCache(conf["cache"], options)
+    prebuilt = {} if conf["build"] is None else loadBuild(conf["build"], options)
+
+    paths    = sourceFiles("source")
+    sources  = readSources(paths)
+    shipped  = sorted(set(prebuilt).difference(paths))
+    paths   += shipped
+    sources += [None] * len(shipped)
+
+    pages = []
+    for path, source in zip(paths, sources):
+        page = None
+
+        if path in prebuilt:
+            if source is None or prebuilt[path]["sha256"] == sha256(source.encode()).hexdigest():
+                page = loadPrebuilt(conf["build"], prebuilt[path])
+            else:
+                print(f"{path} changed since it was built, recompiling.")
+
+        if page is None and cache is not None and source is not None:
+            page = cache.load(path, source)
+
+        pages.append(page)
+
+    pending = [index for index, page in enumerate(pages) if page is None and sources[index] is not None]
+
+    if conf["lazy"]:
+        compiled = {}
+    else:
+        compiled = compileParallel(paths, sources, pending, options, conf["jobs"])
+
+    watched = {}
+    for index, path in enumerate(paths):
+        print(f"Loading {path}")
+        page = pages[index]
+
+        if sources[index] is not None:
+            stat = os.stat(path)
+            watched[path] = ((stat.st_mtime_ns, stat.st_size), sha256(sources[index].encode()).hexdigest(), None)
+
+        if page is None:
+            if sources[index] is None:
+                print(f"Couldn't load prebuilt page {path}.")
+                error = True
+                continue
+
+            if conf["lazy"]:
+                explicit       = scanRoute(sources[index])
+                route, methods = pageRoute(path, explicit)
+
+                if explicit is None:
+                    print(f"{path}'s route was not found. assigning dummy route: {route}")
+
+                watched[path] = watched[path][:2] + ((route, methods),)
+                pinq.add_url_rule(
+                    route, path, LazyPage(path, sources[index], index, explicit, options, cache, runtime), methods = methods
+                )
+                continue
+
+            if index in compiled:
+                page, diagnostics = compiled[index]
+            else:
+                page, diagnostics = parser.compilePage(path, sources[index], index)
+
+            if page is None or not conf["production"]:
+                for diagnostic in diagnostics:
+                    diagnostic.render()
+
+            if page is None:
+                error = True
+                continue
+
+            if cache is not None:
+                cache.store(path, sources[index], *page)
+
+        explicit, entry, code = page
+        route, methods        = pageRoute(path, explicit)
+
+        if explicit is None:
+            print(f"{path}'s route was not found. assigning dummy route: {route}")
+
+        if path in watched:
+            watched[path] = watched[path][:2] + ((route, methods),)
+
+        namespace = dict(runtime)
+        exec(code, namespace)
+        pinq.add_url_rule(route, path, installView(namespace[entry]), methods = methods)
+
+    if parser.compiler.profiler is not None:
+        print(parser.compiler.profiler.summary())
+
+    parser = sources = compiled = pages = source = page = diagnostics = None
+
     if not error:
-        pinq.run(host = conf["ip"], port = conf["port"])
\ No newline at end of file
+        def setup():
+            if conf["watch"] != 0:
+                Watcher(pinq, runtime, options, cache, conf["watch"], watched, len(paths)).start()
+
+        if conf["server"] == "asgi":
+            try:
+                import uvicorn
+            except ImportError:
+                print("uvicorn is not installed! Using the WSGI server.")
+                conf["server"] = "wsgi"
+
+        if conf["server"] == "asgi":
+            setup()
+            uvicorn.run(ASGIApp(pinq, conf["threads"]), host = conf["ip"], port = conf["port"])
+        elif conf["workers"] != 0 and hasattr(os, "fork"):
+            Master(pinq, conf["ip"], conf["port"], conf["workers"], conf["threads"] or 1, setup, [sys.executable, __file__]).run()
+        else:
+            setup()
+            pinq.run(host = conf["ip"], port = conf["port"])
\ No newline at end of file
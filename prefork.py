@@ -0,0 +1,226 @@
+"""
+MIT License
+
+Copyright (c) 2023 Amari Calipso
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving   import BaseWSGIServer, WSGIRequestHandler, select_address_family
+from threading          import Thread
+import os, gc, sys, time, signal, socket
+
+class PoolRequestHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+class PooledWSGIServer(BaseWSGIServer):
+    multithread  = True
+    multiprocess = True
+
+    def __init__(self, host, port, app, threads, fd):
+        super().__init__(host, port, app, PoolRequestHandler, fd = fd)
+        self.pool = ThreadPoolExecutor(threads)
+
+    def __process(self, request, address):
+        try:
+            self.finish_request(request, address)
+        except Exception:
+            self.handle_error(request, address)
+        finally:
+            self.shutdown_request(request)
+
+    def process_request(self, request, address):
+        self.pool.submit(self.__process, request, address)
+
+    def drain(self, *args):
+        Thread(target = self.shutdown, daemon = True).start()
+
+LISTENER_ENV    = "PINQ_LISTENER"
+PREDECESSOR_ENV = "PINQ_PREDECESSOR"
+
+class Master:
+    def __init__(self, app, host, port, workers, threads, setup = None, argv = None):
+        self.app       = app
+        self.host      = host
+        self.port      = port
+        self.workers   = workers
+        self.threads   = threads
+        self.setup     = setup
+        self.argv      = [sys.executable] + sys.argv if argv is None else argv
+        self.children  = {}
+        self.stopping  = False
+        self.listener  = None
+        self.successor = None
+
+    def __worker(self, ready):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, (signal.SIGTERM, signal.SIGINT, signal.SIGHUP))
+
+        server = PooledWSGIServer(self.host, self.port, self.app, self.threads, self.listener.fileno())
+        signal.signal(signal.SIGTERM, server.drain)
+
+        if self.setup is not None:
+            self.setup()
+
+        if ready is not None:
+            os.write(ready, b"\0")
+            os.close(ready)
+
+        server.serve_forever()
+        server.pool.shutdown(wait = True)
+        server.server_close()
+
+    def __spawn(self, ready = None):
+        signal.pthread_sigmask(signal.SIG_BLOCK, (signal.SIGTERM, signal.SIGINT, signal.SIGHUP))
+        pid = os.fork()
+
+        if pid == 0:
+            code = 1
+
+            try:
+                self.__worker(ready)
+                code = 0
+            finally:
+                os._exit(code)
+
+        self.children[pid] = time.monotonic()
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, (signal.SIGTERM, signal.SIGINT, signal.SIGHUP))
+
+    def __listen(self):
+        inherited = os.environ.pop(LISTENER_ENV, None)
+
+        if inherited is not None:
+            fd, port, host = inherited.split(",", 2)
+
+            if host == self.host and int(port) == self.port:
+                return socket.socket(fileno = int(fd))
+
+            os.close(int(fd))
+
+        family = select_address_family(self.host, self.port)
+        return socket.create_server((self.host, self.port), family = family, backlog = 1024)
+
+    def __reload(self, *args):
+        if self.stopping or self.successor is not None:
+            return
+
+        print(f"pinq! master {os.getpid()} starting a new generation")
+
+        os.set_inheritable(self.listener.fileno(), True)
+        environ = dict(os.environ)
+        environ[LISTENER_ENV]    = f"{self.listener.fileno()},{self.port},{self.host}"
+        environ[PREDECESSOR_ENV] = str(os.getpid())
+
+        signal.pthread_sigmask(signal.SIG_BLOCK, (signal.SIGTERM, signal.SIGINT, signal.SIGHUP))
+        pid = os.fork()
+
+        if pid == 0:
+            try:
+                signal.pthread_sigmask(signal.SIG_SETMASK, ())
+                os.execve(self.argv[0], self.argv, environ)
+            finally:
+                os._exit(1)
+
+        self.successor = pid
+        os.set_inheritable(self.listener.fileno(), False)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, (signal.SIGTERM, signal.SIGINT, signal.SIGHUP))
+
+    def __handoff(self, ready):
+        predecessor = os.environ.pop(PREDECESSOR_ENV, None)
+
+        count = 0
+        while True:
+            data = os.read(ready, self.workers)
+            if len(data) == 0:
+                break
+
+            count += len(data)
+
+        os.close(ready)
+
+        if count == 0:
+            print("pinq! no worker started, stopping")
+            self.__stop()
+            return
+
+        if predecessor is not None:
+            print(f"pinq! {count} workers ready, draining master {predecessor}")
+
+            try:
+                os.kill(int(predecessor), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def __stop(self, *args):
+        self.stopping = True
+
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        self.listener = self.__listen()
+
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self.__stop)
+        signal.signal(signal.SIGINT,  self.__stop)
+        signal.signal(signal.SIGHUP,  self.__reload)
+
+        readyRead, readyWrite = os.pipe()
+        for _ in range(self.workers):
+            self.__spawn(readyWrite)
+
+        os.close(readyWrite)
+
+        print(f"pinq! master {os.getpid()} serving on {self.host}:{self.port} with {self.workers} workers, {self.threads} threads each")
+        self.__handoff(readyRead)
+
+        while len(self.children) != 0:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            if pid == self.successor:
+                self.successor = None
+
+                if not self.stopping:
+                    print(f"New generation {pid} exited with status {os.waitstatus_to_exitcode(status)}, keeping the current workers")
+
+                continue
+
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, respawning")
+
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+
+            if not self.stopping:
+                self.__spawn()
+
+        self.listener.close()
@@ -22,7 +22,39 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import colorama
+from array  import array
+from bisect import bisect_left, bisect_right
+from time   import perf_counter
+import colorama, builtins, ast, sys, re
+
+VERSION = "2023.4.19"
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>[ \t]+)
+  | (?P<newline>\n)
+  | (?P<comment>\#[^\n]*)
+  | (?P<string>"[^"]*"?|'[^']*'?)
+  | (?P<word>\w+)
+  | (?P<symbol>.)
+""", re.VERBOSE | re.DOTALL)
+
+QUOTES = ('"', "'")
+
+class TokenKind:
+    WORD, SYMBOL, STRING, SYNTHETIC = range(4)
+
+TOKEN_KINDS = {"word": TokenKind.WORD, "symbol": TokenKind.SYMBOL, "string": TokenKind.STRING}
+
+CLOSING  = {")": "(", "]": "[", "}": "{"}
+BRACKETS = {"(": "()", ")": "()", "[": "[]", "]": "[]", "{": "{}", "}": "{}"}
+
+# tokens that absorb the next token when it starts with one of the given characters
+MERGES = {
+    "+": "=", "-": "=", "|": "=", "&": "=", "!": "=", ":": "=", "^": "=", "%": "=", "=": "=",
+    "*": "*=", "/": "/=", ">": ">=", "<": "<=", "**": "=", "//": "=", ">>": "=", "<<": "=",
+    "f": QUOTES, "r": QUOTES, "b": QUOTES, "fr": QUOTES, "br": QUOTES, "rf": QUOTES, "rb": QUOTES,
+    '""': '"', "''": "'"
+}
 
 SET_OPS = ("+=", "-=", "**=", "//=", "*=", "/=", "%=", "&=", "|=", "^=", ">>=", "<<=", "@=", "=")
 
@@ -125,8 +157,179 @@ OPERATORS = {
     "~": "__invert__"
 }
 
+MESSAGE_COLORS = {
+    "error":   colorama.Fore.RED,
+    "warning": colorama.Fore.LIGHTYELLOW_EX
+}
+
+PURE_DECORATORS = ("abstractmethod", "staticmethod", "property")
+
+# CPython's tokenizer rejects a 100th level of indentation, and the entry point
+# already sits one level in, so blocks nest at most MAX_INDENT - 2 deep
+MAX_INDENT = 100
+
+RENDER_BUFFERS = {
+    "str":  ("_HTML_BUF={}",                                  "_HTML_BUF+={}",        "_HTML_BUF",             "_QINP_ECHO={};_HTML_BUF+=_QINP_ECHO"),
+    "list": ("_HTML_BUF=[{}]",                                "_HTML_BUF.append({})", '"".join(_HTML_BUF)',    "_HTML_BUF.append({})"),
+    "io":   ("_HTML_BUF=_QINP_StringIO();_HTML_BUF.write({})", "_HTML_BUF.write({})",  "_HTML_BUF.getvalue()", "_HTML_BUF.write({})")
+}
+
 def encode(buffer):
-    return "".join(map(lambda char: rf"\u{ord(char):04x}", buffer))
+    return repr(buffer)
+
+def sourceLine(lines, lineno):
+    if lineno > len(lines):
+        lineno = len(lines)
+
+    while lineno > 0 and lines[lineno - 1] == 0:
+        lineno -= 1
+
+    if lineno == 0:
+        return 1
+
+    return lines[lineno - 1]
+
+def writeVarint(table, value):
+    while value >= 64:
+        table.append(0x40 | (value & 63))
+        value >>= 6
+
+    table.append(value)
+
+def writeRun(table, line, units, current):
+    # 3.11+ location entries: 0xF8 is "no location", 0xE8 is "no columns" with a signed line delta,
+    # the low 3 bits hold the number of code units covered minus one
+    if units == 0:
+        return current
+
+    if line is None:
+        while units > 0:
+            size   = min(units, 8)
+            units -= size
+            table.append(0xF8 | (size - 1))
+
+        return current
+
+    delta  = line - current
+    size   = min(units, 8)
+    units -= size
+    table.append(0xE8 | (size - 1))
+    writeVarint(table, (-delta << 1) | 1 if delta < 0 else delta << 1)
+
+    while units > 0:
+        size   = min(units, 8)
+        units -= size
+        table.append(0xE8 | (size - 1))
+        table.append(0)
+
+    return line
+
+def sourceLines(lines):
+    mapped = [1] * (len(lines) + 1)
+    last   = 1
+
+    for i, line in enumerate(lines):
+        if line != 0:
+            last = line
+
+        mapped[i + 1] = last
+
+    return mapped
+
+def remapLines(code, lines, mapped = None):
+    if mapped is None:
+        mapped = sourceLines(lines)
+
+    limit   = len(mapped) - 1
+    first   = mapped[min(code.co_firstlineno, limit)]
+    current = first
+    table   = bytearray()
+
+    runLine  = None
+    runUnits = 0
+    for start, end, line in code.co_lines():
+        if line is not None:
+            line = mapped[min(line, limit)]
+
+        if line == runLine:
+            runUnits += (end - start) // 2
+            continue
+
+        current  = writeRun(table, runLine, runUnits, current)
+        runLine  = line
+        runUnits = (end - start) // 2
+
+    writeRun(table, runLine, runUnits, current)
+
+    consts = tuple(remapLines(const, lines, mapped) if isinstance(const, type(code)) else const for const in code.co_consts)
+    return code.replace(co_firstlineno = first, co_linetable = bytes(table), co_consts = consts)
+
+def remapTree(tree, lines):
+    for node in ast.walk(tree):
+        if hasattr(node, "lineno"):
+            node.lineno = sourceLine(lines, node.lineno)
+
+            if getattr(node, "end_lineno", None) is not None:
+                node.end_lineno = max(node.lineno, sourceLine(lines, node.end_lineno))
+
+    return tree
+
+def commonPrefix(a, b, limit):
+    low, high = 0, limit
+
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+def commonSuffix(a, b, limit):
+    low, high = 0, limit
+
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+def contextLines(line, maxline):
+    if line <= 3:
+        return range(1, min(6, maxline))
+
+    if line >= maxline - 3:
+        return range(maxline - 5, maxline)
+
+    return range(line - 3, line + 2)
+
+def printMessage(type_, msg, lines, maxline, line, pos, length):
+    color = MESSAGE_COLORS[type_]
+
+    if lines is None:
+        print(color + f"{type_}{colorama.Style.RESET_ALL}:", msg)
+        return
+
+    maxlineLen = len(str(maxline))
+
+    print(color + f"{type_}{colorama.Style.RESET_ALL} (line {line - 1}, pos {pos}):", msg)
+
+    for current in contextLines(line, maxline):
+        if current == line - 1:
+            print(
+                f"{str(current).rjust(maxlineLen)} | " + lines[current].rstrip() + "\n" +
+                (" " * maxlineLen) + " |" + (" " * (pos + 1)) + color + ("^" * length) + colorama.Style.RESET_ALL
+            )
+
+            continue
+
+        print(f"{str(current).rjust(maxlineLen)} | " + lines[current].rstrip())
 
 class NameStack:
     def __init__(self):
@@ -171,69 +374,546 @@ class NameStack:
 
         return out.strip()[:-1]
 
+class Profiler:
+    def __init__(self):
+        self.calls    = {}
+        self.seconds  = {}
+        self.__depth  = {}
+        self.__since  = {}
+        self.__stack  = []
+        self.__join   = None
+
+    def wrap(self, name, fn):
+        self.calls.setdefault(name, 0)
+        self.seconds.setdefault(name, 0.0)
+        self.__depth.setdefault(name, 0)
+
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            self.open(name)
+            self.__stack.append(name)
+
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.__stack.pop()
+                self.close(name)
+
+        return wrapper
+
+    def open(self, name):
+        if self.__depth[name] == 0:
+            self.__since[name] = perf_counter()
+
+        self.__depth[name] += 1
+
+    def close(self, name):
+        self.__depth[name] -= 1
+
+        if self.__depth[name] == 0:
+            self.seconds[name] += perf_counter() - self.__since[name]
+
+    def claim(self):
+        if len(self.__stack) == 0:
+            return None
+
+        name = self.__stack[-1]
+        self.open(name)
+        return name
+
+    def __enter__(self):
+        self.__join = Tokens.join
+        Tokens.join = self.wrap("Tokens.join", self.__join)
+        return self
+
+    def __exit__(self, *exc):
+        Tokens.join = self.__join
+
+    def results(self):
+        return {name: {"calls": self.calls[name], "seconds": self.seconds[name]} for name in self.calls}
+
+    def summary(self):
+        total = self.seconds.get("compile", 0.0)
+        lines = [f"{'name':24s} | {'calls':>8s} | {'total ms':>10s} | {'mean us':>9s} | {'compile':>7s}"]
+
+        for name in sorted(self.calls, key = lambda name: self.seconds[name], reverse = True):
+            if self.calls[name] == 0:
+                continue
+
+            seconds = self.seconds[name]
+            percent = f"{seconds / total * 100:6.1f}%" if total != 0 else "      -"
+            lines.append(f"{name:24s} | {self.calls[name]:8d} | {seconds * 1e3:10.3f} | {seconds / self.calls[name] * 1e6:9.2f} | {percent}")
+
+        return "\n".join(lines)
+
 class GenericLoop: pass
 
 class CompLoop:
     def __init__(self, comp):
         self.comp = comp
 
-class Token:
-    def __init__(self, tok, line = 0, pos = 0, tokens = None):
-        self.tok     : str = tok
-        self.line    : int = line
-        self.pos     : int = pos
-        self.maxline : int = 1000
+class Statements(list):
+    def line(self, tabs, text):
+        self.append(text)
+
+class Frame:
+    __slots__ = ("tokens", "tabs", "loop", "scope", "tail", "match", "owner")
+
+    def __init__(self, tokens, tabs, loop, scope = None, tail = "", match = False, owner = None):
+        self.tokens = tokens
+        self.tabs   = tabs
+        self.loop   = loop
+        self.scope  = scope
+        self.tail   = tail
+        self.match  = match
+        self.owner  = owner
+
+class Unit:
+    __slots__ = ("headers", "out", "diagnostics", "hadError", "line")
+
+    def __init__(self, headers, out, diagnostics, hadError, line):
+        self.headers     = headers
+        self.out         = out
+        self.diagnostics = diagnostics
+        self.hadError    = hadError
+        self.line        = line
+
+class Emitter:
+    INDENTS = [""]
+
+    def __init__(self, text = ""):
+        self.__fragments = [text]
+        self.source      = 0
+        self.lines       = array("i", [0] * text.count("\n"))
+
+    @classmethod
+    def indent(self, tabs):
+        while len(self.INDENTS) <= tabs:
+            self.INDENTS.append(" " * len(self.INDENTS))
+
+        return self.INDENTS[tabs]
+
+    def __track(self, text):
+        count = text.count("\n")
 
-        self.tokens : Tokens = tokens
+        if count == 1:
+            self.lines.append(self.source)
+        elif count != 0:
+            self.lines.extend(array("i", [self.source]) * count)
 
-    def __getlines(self):
-        if self.line <= 3:
-            return range(1, min(6, self.maxline))
+    def write(self, *fragments):
+        self.__fragments.extend(fragments)
 
-        if self.line >= self.maxline - 3:
-            return range(self.maxline - 5, self.maxline)
+        for fragment in fragments:
+            self.__track(fragment)
 
-        return range(self.line - 3, self.line + 2)
+    def line(self, tabs, text):
+        self.__fragments.extend((self.indent(tabs), text, "\n"))
+        self.__track(text)
+        self.lines.append(self.source)
 
-    def __message(self, type_, color, msg):
-        if self.tokens is None: print(color + f"{type_}{colorama.Style.RESET_ALL}:", msg)
+    def block(self, tabs, header, empty):
+        self.__fragments.extend((self.indent(tabs), header, ":pass\n" if empty else ":\n"))
+        self.__track(header)
+        self.lines.append(self.source)
+
+    def extend(self, other, delta = 0):
+        self.__fragments.append(other.getvalue())
+
+        if delta == 0:
+            self.lines.extend(other.lines)
         else:
-            maxlineLen = len(str(self.maxline))
+            self.lines.extend(array("i", (line + delta if line != 0 else 0 for line in other.lines)))
 
-            print(color + f"{type_}{colorama.Style.RESET_ALL} (line {self.line - 1}, pos {self.pos}):", msg)
+    def getvalue(self):
+        if len(self.__fragments) != 1:
+            self.__fragments = ["".join(self.__fragments)]
 
-            for line in self.__getlines():
-                if line == self.line - 1:
-                    print(
-                        f"{str(line).rjust(maxlineLen)} | " + self.tokens.source[line].rstrip() + "\n" +
-                        (" " * maxlineLen) + " |" + (" " * (self.pos + 1)) + color + ("^" * len(self.tok)) + colorama.Style.RESET_ALL
-                    )
+        return self.__fragments[0]
 
-                    continue
+    def __str__(self):
+        return self.getvalue()
+
+class Streamer(ast.NodeTransformer):
+    def __init__(self, drain):
+        self.drain = drain
+
+    def __buffer(self):
+        return ast.Name("_HTML_BUF", ast.Load())
+
+    def __clear(self, node):
+        return ast.copy_location(ast.Assign([ast.Name("_HTML_BUF", ast.Store())], ast.Constant("")), node)
+
+    def __yield(self, value, node):
+        return ast.copy_location(ast.Expr(ast.Yield(value)), node)
+
+    def visit_FunctionDef(self, node):
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef         = visit_FunctionDef
+    visit_Lambda           = visit_FunctionDef
+
+    def visit_Assign(self, node):
+        match node.targets:
+            case [ast.Name(id = "_HTML_BUF")]:
+                return [self.__clear(node), self.__yield(node.value, node)]
+
+        return node
+
+    def visit_AugAssign(self, node):
+        match node:
+            case ast.AugAssign(target = ast.Name(id = "_HTML_BUF"), op = ast.Add()):
+                if not self.drain:
+                    return self.__yield(node.value, node)
+
+                value = ast.BinOp(self.__buffer(), ast.Add(), node.value)
+                return [self.__yield(value, node), self.__clear(node)]
+
+        return node
 
-                print(f"{str(line).rjust(maxlineLen)} | " + self.tokens.source[line].rstrip())
+    def visit_Return(self, node):
+        if not self.drain:
+            return ast.copy_location(ast.Return(), node)
+
+        pending = ast.copy_location(ast.If(self.__buffer(), [self.__yield(self.__buffer(), node)], []), node)
+        return [pending, ast.copy_location(ast.Return(), node)]
+
+    def stream(self, entry):
+        self.generic_visit(entry)
+        ast.fix_missing_locations(entry)
+
+class Token:
+    __slots__ = ("__tok", "line", "pos", "tokens", "index")
+
+    def __init__(self, tok, line = 0, pos = 0, tokens = None, index = -1):
+        self.__tok  : str        = tok
+        self.line   : int        = line
+        self.pos    : int        = pos
+        self.tokens : TokenStore = tokens
+        self.index  : int        = index
+
+    @property
+    def tok(self):
+        if self.__tok is None:
+            self.__tok = self.tokens.text(self.index)
+
+        return self.__tok
+
+    @tok.setter
+    def tok(self, value):
+        self.__tok = value
+
+    @property
+    def maxline(self):
+        if self.tokens is None:
+            return 1000
+
+        return self.tokens.maxline
 
     def error(self, msg):
-        self.__message("error", colorama.Fore.RED, msg)
+        printMessage("error", msg, None if self.tokens is None else self.tokens.lines, self.maxline, self.line, self.pos, len(self.tok))
 
     def warning(self, msg):
-        self.__message("warning", colorama.Fore.LIGHTYELLOW_EX, msg)
+        printMessage("warning", msg, None if self.tokens is None else self.tokens.lines, self.maxline, self.line, self.pos, len(self.tok))
 
-class Tokens:
+class Diagnostic:
+    __slots__ = ("type", "offset", "length", "message", "source")
+
+    def __init__(self, type_, token : Token, message):
+        self.type    = type_
+        self.message = message
+        self.length  = len(token.tok)
+
+        if token.tokens is None:
+            self.offset = -1
+            self.source = None
+        else:
+            self.offset = token.tokens.start[token.index]
+            self.source = token.tokens.source
+
+    @classmethod
+    def atLine(self, type_, source, line, message):
+        start = 0
+        for _ in range(line - 1):
+            start = source.find("\n", start) + 1
+
+            if start == 0:
+                start = len(source)
+                break
+
+        end  = source.find("\n", start)
+        text = source[start:len(source) if end == -1 else end]
+
+        diagnostic = self.__new__(self)
+        diagnostic.type    = type_
+        diagnostic.message = message
+        diagnostic.offset  = start + len(text) - len(text.lstrip())
+        diagnostic.length  = max(1, len(text.strip()))
+        diagnostic.source  = source
+        return diagnostic
+
+    def render(self):
+        if self.source is None:
+            printMessage(self.type, self.message, None, 0, 0, 0, self.length)
+            return
+
+        lineStart = self.source.rfind("\n", 0, self.offset) + 1
+        lines     = self.source.split("\n")
+
+        printMessage(
+            self.type, self.message, lines, len(lines),
+            self.source.count("\n", 0, self.offset) + 1, self.offset - lineStart, self.length
+        )
+
+class TokenStore:
     def __init__(self, source):
-        if   type(source) is str:
-            self.tokens = self.tokenize(source)
-            self.source = source.split("\n")
-        elif type(source) is list:
-            self.tokens = source
-            self.source = []
+        self.source  = source
+        self.kind    = array("i")
+        self.start   = array("i")
+        self.end     = array("i")
+        self.line    = array("i")
+        self.pos     = array("i")
+        self.maxline = 1
+
+        # text of tokens that are not a plain slice of the source (merged across whitespace, or synthetic)
+        self.texts = {}
+
+        # bracket index: position of the matching bracket (-1 if unmatched or not a bracket) and nesting depth of each token
+        self.match      = array("i")
+        self.depth      = array("i")
+        self.semicolons = {}
+        self.escapes    = array("i")
+
+        # lexer state at the start of each line where re-lexing can resume (see Tokens.relex)
+        self.checkOffset = array("i")
+        self.checkToken  = array("i")
+        self.checkLine   = array("i")
+        self.checkSym    = array("b")
+
+        self.__opened  = {"(": [], "[": [], "{": []}
+        self.__current = 0
+        self.__escaped = False
+        self.__lines   = None
+
+    @property
+    def lines(self):
+        if self.__lines is None:
+            self.__lines = self.source.split("\n")
+
+        return self.__lines
+
+    def text(self, index):
+        if index in self.texts:
+            return self.texts[index]
+
+        return self.source[self.start[index]:self.end[index]]
+
+    def append(self, kind, start, end, line, pos):
+        self.kind.append(kind)
+        self.start.append(start)
+        self.end.append(end)
+        self.line.append(line)
+        self.pos.append(pos)
+        self.match.append(-1)
+        self.depth.append(self.__current)
+
+    def track(self, tok, index):
+        if self.__escaped:
+            self.__escaped = False
+        elif tok in self.__opened:
+            self.__opened[tok].append(index)
+            self.__current += 1
+        elif tok in CLOSING:
+            opened = self.__opened[CLOSING[tok]]
+
+            if len(opened) != 0:
+                partner = opened.pop()
+                self.match[partner] = index
+                self.match[index]   = partner
+
+                self.__current   -= 1
+                self.depth[index] = self.__current
+        elif tok == ";":
+            if self.__current not in self.semicolons:
+                self.semicolons[self.__current] = array("i")
+
+            self.semicolons[self.__current].append(index)
+        elif tok == "\\":
+            self.__escaped = True
+            self.escapes.append(index)
+
+    def reindex(self):
+        count = len(self.kind)
+
+        self.match      = array("i", [-1]) * count
+        self.depth      = array("i", [0]) * count
+        self.semicolons = {}
+        self.escapes    = array("i")
+        self.__opened   = {"(": [], "[": [], "{": []}
+        self.__current  = 0
+        self.__escaped  = False
+
+        for index in range(count):
+            self.depth[index] = self.__current
+
+            if self.kind[index] == TokenKind.SYMBOL or (self.__escaped and self.kind[index] != TokenKind.SYNTHETIC):
+                self.track(self.text(index), index)
+
+    def checkpoint(self, offset, line, lastSym):
+        self.checkOffset.append(offset)
+        self.checkToken.append(len(self.kind))
+        self.checkLine.append(line)
+        self.checkSym.append(lastSym)
+
+    def findCheckpoint(self, offset):
+        index = bisect_left(self.checkOffset, offset)
+
+        if index < len(self.checkOffset) and self.checkOffset[index] == offset:
+            return index
+
+        return -1
+
+    def lastText(self, checkpoint):
+        if self.checkToken[checkpoint] == 0:
+            return None
+
+        return self.text(self.checkToken[checkpoint] - 1)
+
+    def restore(self, old, checkpoint):
+        count = old.checkToken[checkpoint]
+
+        for name in ("kind", "start", "end", "line", "pos", "match", "depth"):
+            getattr(self, name).extend(getattr(old, name)[:count])
+
+        for name in ("checkOffset", "checkToken", "checkLine", "checkSym"):
+            getattr(self, name).extend(getattr(old, name)[:checkpoint + 1])
+
+        self.texts = {index: text for index, text in old.texts.items() if index < count}
+
+    def splice(self, old, checkpoint, delta, lineDelta):
+        first = old.checkToken[checkpoint]
+        shift = len(self.kind) - first
+
+        self.kind.extend(old.kind[first:])
+        self.start.extend(map(delta.__add__, old.start[first:]))
+        self.end.extend(map(delta.__add__, old.end[first:]))
+        self.line.extend(map(lineDelta.__add__, old.line[first:]))
+        self.pos.extend(old.pos[first:])
+
+        self.checkOffset.extend(map(delta.__add__, old.checkOffset[checkpoint:]))
+        self.checkToken.extend(map(shift.__add__, old.checkToken[checkpoint:]))
+        self.checkLine.extend(map(lineDelta.__add__, old.checkLine[checkpoint:]))
+        self.checkSym.extend(old.checkSym[checkpoint:])
+
+        for index, text in old.texts.items():
+            if index >= first:
+                self.texts[index + shift] = text
+
+                if self.kind[index + shift] == TokenKind.SYNTHETIC:
+                    self.line[index + shift] = 0
+
+        self.maxline = old.maxline + lineDelta
+
+    def extend(self, index, start, end):
+        if index in self.texts or self.end[index] != start:
+            self.texts[index] = self.text(index) + self.source[start:end]
+
+        self.end[index] = end
+
+    def pop(self):
+        index = len(self.kind) - 1
+        self.texts.pop(index, None)
+
+        for column in (self.kind, self.start, self.end, self.line, self.pos, self.match, self.depth):
+            column.pop()
+
+    def countSemicolons(self, depth, begin, end):
+        if depth not in self.semicolons:
+            return 0
+
+        positions = self.semicolons[depth]
+        return bisect_left(positions, end) - bisect_left(positions, begin)
+
+    def hasEscapes(self, begin, end):
+        i = bisect_left(self.escapes, begin)
+        return i < len(self.escapes) and self.escapes[i] < end
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            start, end, _ = index.indices(len(self.kind))
+            return TokenRange(self, start, max(start, end))
+
+        if index < 0:
+            index += len(self.kind)
+
+        if self.kind[index] == TokenKind.SYNTHETIC:
+            return Token(self.texts[index])
+
+        return Token(None, self.line[index], self.pos[index], self, index)
+
+    def __iter__(self):
+        for i in range(len(self.kind)):
+            yield self[i]
 
-        self.pos = 0
+class TokenRange:
+    __slots__ = ("store", "start", "end")
+
+    def __init__(self, store, start, end):
+        self.store : TokenStore = store
+        self.start : int        = start
+        self.end   : int        = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            start, end, _ = index.indices(self.end - self.start)
+            return TokenRange(self.store, self.start + start, self.start + max(start, end))
+
+        if index < 0:
+            index += self.end - self.start
+
+        if not 0 <= index < self.end - self.start:
+            raise IndexError("token index out of range")
+
+        return self.store[self.start + index]
+
+    def __iter__(self):
+        for i in range(self.start, self.end):
+            yield self.store[i]
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+class Tokens:
+    def __init__(self, source):
+        if type(source) is str:
+            source = self.tokenize(source)
+
+        self.tokens = source
+        self.pos    = 0
+
+        if type(source) is TokenStore:
+            self.store  = source
+            self.offset = 0
+        elif type(source) is TokenRange:
+            self.store  = source.store
+            self.offset = source.start
+        else:
+            self.store  = None
+            self.offset = 0
 
     def copy(self):
         tmp = Tokens(self.tokens)
-        tmp.pos    = self.pos
-        tmp.source = self.source
+        tmp.pos = self.pos
 
         return tmp
 
@@ -255,247 +935,153 @@ class Tokens:
     def last(self) -> Token:
         return self.tokens[self.pos - 1]
 
-    @classmethod
-    def replaceTokens(self, tokens):
-        i = 0
-        while i < len(tokens):
-            match tokens[i].tok:
-                case "super":
-                    if i + 1 < len(tokens) and tokens[i + 1].tok != "(":
-                        tokens.insert(i + 1, Token("()"))
-                        i += 1
-            i += 1
-
-        return tokens
-
-    @classmethod
-    def verifyTok(self, tokens: list, first: Token, next: Token, opt):
-        if next.tok == opt:
-            first.tok += next.tok
-            tokens.append(first)
-            return True
-
-        tokens.append(first)
-        return False
-
     def join(self):
-        buf = ""
+        buf = []
         lastIsIdentifier = False
         lastIdentifier   = None
         for token in self.tokens:
-            if token.tok.isidentifier():
+            tok = token.tok
+
+            if tok.isidentifier():
                 if lastIsIdentifier:
-                    buf += " " + token.tok
-                    lastIdentifier = token.tok
+                    buf.append(" ")
+                    buf.append(tok)
+                    lastIdentifier = tok
                     continue
 
                 lastIsIdentifier = True
             else:
-                lastIsIdentifier = token.tok.isdigit()
+                lastIsIdentifier = tok.isdigit()
 
-                if lastIdentifier is not None and (lastIdentifier + token.tok).isidentifier():
-                    buf += " " + token.tok
-                    lastIdentifier = token.tok
+                if lastIdentifier is not None and (lastIdentifier + tok).isidentifier():
+                    buf.append(" ")
+                    buf.append(tok)
+                    lastIdentifier = tok
                     continue
 
-            lastIdentifier = token.tok
-            buf += token.tok
+            lastIdentifier = tok
+            buf.append(tok)
+
+        return "".join(buf)
+
+    @classmethod
+    def mergeEmptyString(self, store, last = False):
+        index = len(store) - 1
+        empty = store.text(index)
+
+        if index > 0 and store.text(index - 1).endswith(empty[0]):
+            store.extend(index - 1, store.start[index], store.end[index])
+            store.pop()
+        elif last:
+            store.pop()
 
-        return buf
+            if index > 1 and store.kind[index - 1] == TokenKind.SYNTHETIC and store.text(index - 2) == "super":
+                store.pop()
 
     def tokenize(self, source):
-        line = 1
-        pos  = 0
-        tmp           = [Token("", line, pos, self)]
-        inLineComment = False
-        inString      = False
-        inStringAlt   = False
-        lastSym       = False
-
-        for ch in source:
-            if inLineComment:
-                if ch == "\n":
-                    inLineComment = False
-                    line += 1
-                    pos   = 0
-                    tmp.append(Token("", line, pos, self))
-                    continue
+        return self.__scan(TokenStore(source), 0, 1, False)
 
-                pos += 1
-                continue
+    @classmethod
+    def relex(self, old, source):
+        limit = min(len(old.source), len(source))
+        start = commonPrefix(old.source, source, limit)
 
-            match ch:
-                case " " | "\t":
-                    if inString or inStringAlt: tmp[-1].tok += ch
-                    else:
-                        tmp.append(Token("", line, pos + 1, self))
-                case "#":
-                    if inString or inStringAlt: tmp[-1].tok += ch
-                    else:
-                        inLineComment = True
-                case "\n":
-                    line += 1
-                    pos   = 0
+        if start == len(old.source) == len(source):
+            return old
 
-                    if inString or inStringAlt: tmp[-1].tok += ch
-                    else:
-                        tmp.append(Token("", line, pos, self))
-                        continue
-                case '"':
-                    if inString:
-                        tmp[-1].tok += ch
-                        inString = False
-                    elif inStringAlt:
-                        tmp[-1].tok += ch
-                    else:
-                        tmp.append(Token(ch, line, pos, self))
-                        inString = True
-                case "'":
-                    if inStringAlt:
-                        tmp[-1].tok += ch
-                        inStringAlt = False
-                    elif inString:
-                        tmp[-1].tok += ch
-                    else:
-                        tmp.append(Token(ch, line, pos, self))
-                        inStringAlt = True
-                case _:
-                    if inString or inStringAlt:
-                        tmp[-1].tok += ch
-                    elif ch.isalnum() or ch == "_":
-                        if lastSym:
-                            lastSym = False
-                            tmp.append(Token(ch, line, pos, self))
-                        else:
-                            tmp[-1].tok += ch
-                    else:
-                        lastSym = True
-                        tmp.append(Token(ch, line, pos, self))
+        delta   = len(source) - len(old.source)
+        editEnd = len(source) - commonSuffix(old.source, source, limit - start)
+        store   = TokenStore(source)
 
-            pos += 1
+        checkpoint = bisect_right(old.checkOffset, start) - 1
 
-        i = 0
-        while i < len(tmp):
-            if tmp[i].tok == "":
-                tmp.pop(i)
-            else:
-                tmp[i].maxline = line
-                i += 1
+        if checkpoint == -1:
+            self.__scan(store, 0, 1, False, old, editEnd, delta)
+        else:
+            store.restore(old, checkpoint)
+            self.__scan(
+                store, old.checkOffset[checkpoint], old.checkLine[checkpoint],
+                bool(old.checkSym[checkpoint]), old, editEnd, delta
+            )
 
-        tokens = []
-        i = 0
-        while i < len(tmp) - 1:
-            token = tmp[i]
-            i += 1
+        store.reindex()
+        return store
 
-            match token.tok:
-                case "+":
-                    if self.verifyTok(tokens, token, tmp[i], "="): i += 1
-                    continue
-                case "-":
-                    if self.verifyTok(tokens, token, tmp[i], "="): i += 1
-                    continue
-                case "|":
-                    if self.verifyTok(tokens, token, tmp[i], "="): i += 1
+    @classmethod
+    def __scan(self, store, begin, line, lastSym, old = None, editEnd = 0, delta = 0):
+        source    = store.source
+        last      = None if len(store) == 0 else store.text(len(store) - 1)
+        lineStart = begin
+        lastKind  = None
+        absorbs   = None
+
+        for match in TOKEN_PATTERN.finditer(source, begin):
+            kind = match.lastgroup
+
+            match kind:
+                case "space" | "comment":
+                    lastKind = kind
                     continue
-                case "&":
-                    if self.verifyTok(tokens, token, tmp[i], "="): i += 1
+                case "newline":
+                    line     += 1
+                    lineStart = match.end()
+                    lastKind  = kind
+
+                    if absorbs is None and (last is None or last[-1] not in QUOTES):
+                        if old is not None and lineStart >= editEnd:
+                            checkpoint = old.findCheckpoint(lineStart - delta)
+
+                            if checkpoint != -1 and old.checkSym[checkpoint] == lastSym and old.lastText(checkpoint) == last:
+                                store.splice(old, checkpoint, delta, line - old.checkLine[checkpoint])
+                                return store
+
+                        store.checkpoint(lineStart, line, lastSym)
+
                     continue
-                case "f" | "r" | "b" | "fr" | "br" | "rf" | "rb":
-                    if tmp[i].tok.startswith('"') or tmp[i].tok.startswith("'"):
-                        token.tok += tmp[i].tok
-                        i += 1
-                case "!" | ":" | "^" | "%" | "=":
-                    if tmp[i].tok == "=":
-                        token.tok += tmp[i].tok
-                        i += 1
-                case "*":
-                    if tmp[i].tok in ("*", "="):
-                        if tmp[i].tok == "*":
-                            next = tmp[i]
-                            i += 1
-
-                            if i < len(tmp) and tmp[i].tok == "=":
-                                token.tok += next.tok + tmp[i].tok
-                                i += 1
-                            else:
-                                token.tok += next.tok
-                        else:
-                            token.tok += tmp[i].tok
-                            i += 1
-                case "/":
-                    if tmp[i].tok in ("/", "="):
-                        if tmp[i].tok == "/":
-                            next = tmp[i]
-                            i += 1
-
-                            if i < len(tmp) and tmp[i].tok == "=":
-                                token.tok += next.tok + tmp[i].tok
-                                i += 1
-                            else:
-                                token.tok += next.tok
-                        else:
-                            token.tok += tmp[i].tok
-                            i += 1
-                case ">":
-                    if tmp[i].tok in (">", "="):
-                        if tmp[i].tok == ">":
-                            next = tmp[i]
-                            i += 1
-
-                            if i < len(tmp) and tmp[i].tok == "=":
-                                token.tok += next.tok + tmp[i].tok
-                                i += 1
-                            else:
-                                token.tok += next.tok
-                        else:
-                            token.tok += tmp[i].tok
-                            i += 1
-                case "<":
-                    if tmp[i].tok in ("<", "="):
-                        if tmp[i].tok == "<":
-                            next = tmp[i]
-                            i += 1
-
-                            if i < len(tmp) and tmp[i].tok == "=":
-                                token.tok += next.tok + tmp[i].tok
-                                i += 1
-                            else:
-                                token.tok += next.tok
-                        else:
-                            token.tok += tmp[i].tok
-                            i += 1
-                case '""':
-                    if tmp[i].tok.startswith('"'):
-                        token.tok += tmp[i].tok
-                        i += 1
-                    elif len(tokens) > 0 and tokens[-1].tok.endswith('"'):
-                        tokens[-1].tok += token.tok
-                        continue
-                case "''":
-                    if tmp[i].tok.startswith("'"):
-                        token.tok += tmp[i].tok
-                        i += 1
-                    elif len(tokens) > 0 and tokens[-1].tok.endswith("'"):
-                        tokens[-1].tok += token.tok
+                case "symbol":
+                    lastSym = True
+                case "word":
+                    if lastSym:
+                        lastSym = False
+                    elif lastKind == "string":
+                        store.extend(len(store) - 1, match.start(), match.end())
+                        last    = store.text(len(store) - 1)
+                        absorbs = None
                         continue
 
-            tokens.append(token)
+            tok      = match.group()
+            lastKind = kind
 
-        if i < len(tmp):
-            lastTok = tmp[len(tmp) - 1]
+            if absorbs is not None and tok[0] in absorbs:
+                index = len(store) - 1
+                store.extend(index, match.start(), match.end())
+                last = store.text(index)
 
-            match lastTok.tok:
-                case '""':
-                    if tokens[-1].tok.endswith('"'):
-                        tokens[-1].tok += lastTok.tok
-                case "''":
-                    if tokens[-1].tok.endswith("'"):
-                        tokens[-1].tok += lastTok.tok
-                case _:
-                    tokens.append(lastTok)
+                if kind == "string":
+                    store.kind[index] = TokenKind.STRING
+            else:
+                if absorbs in QUOTES:
+                    self.mergeEmptyString(store)
 
-        return self.replaceTokens(tokens)
+                if last == "super" and tok != "(":
+                    store.texts[len(store)] = "()"
+                    store.append(TokenKind.SYNTHETIC, match.start(), match.start(), 0, 0)
+
+                store.append(TOKEN_KINDS[kind], match.start(), match.end(), line, match.start() - lineStart)
+                store.track(tok, len(store) - 1)
+                last = tok
+
+            absorbs = MERGES.get(last)
+
+            if kind == "string" and "\n" in tok:
+                line     += tok.count("\n")
+                lineStart = match.start() + tok.rindex("\n")
+
+        if absorbs in QUOTES:
+            self.mergeEmptyString(store, True)
+
+        store.maxline = line
+        return store
 
 class Compiler:
     def __class(self, tokens: Tokens, tabs, loop):
@@ -518,28 +1104,18 @@ class Compiler:
                 self.nextAbstract = False
                 argsString = "_ABSTRACT_BASE_CLASS_"
 
-        if argsString == "":
-            self.out += (" " * tabs) + "class " + name.tok + ":"
-        else:
-            self.out += (" " * tabs) + "class " + name.tok + "(" + argsString + "):"
+        if argsString == "": header = "class " + name.tok
+        else:                header = "class " + name.tok + "(" + argsString + ")"
 
         block = self.getSameLevelParenthesis("{", "}", tokens)
-        if len(block) == 0:
-            self.out += "pass\n"
-            return loop
+        self.out.block(tabs, header, len(block) == 0)
 
-        self.out += "\n"
-
-        self.__nameStack.push((name.tok, "class"))
-        self.__compiler(Tokens(block), tabs + 1, loop)
-        self.__nameStack.pop()
-        return loop
+        if len(block) != 0:
+            self.__enter(block, tabs + 1, loop, (name.tok, "class"))
 
     def __asyncGen(self, keyw):
         def fn(tokens : Tokens, tabs, loop):
-            self.out += (" " * tabs) + keyw + " "
-
-            return loop
+            self.out.write(self.out.indent(tabs), keyw, " ")
 
         return fn
 
@@ -550,14 +1126,12 @@ class Compiler:
         next = tokens.peek()
         if next.tok == ";":
             tokens.next()
-            self.out += (" " * tabs) + "return\n"
-            return loop
+            self.out.line(tabs, "return")
+            return
 
         _, val = self.getUntilNotInExpr(";", tokens, True, advance = False)
 
-        self.out += (" " * tabs) + Tokens([Token("return")] + val).join() + "\n"
-
-        return loop
+        self.out.line(tabs, Tokens([Token("return")] + val).join())
 
     def __break(self, tokens : Tokens, tabs, loop):
         keyw = tokens.last()
@@ -568,11 +1142,9 @@ class Compiler:
 
         if loop is None:
             self.__error('cannot use "break" outside of a loop', keyw)
-            return loop
-
-        self.out += (" " * tabs) + "break\n"
+            return
 
-        return loop
+        self.out.line(tabs, "break")
 
     def __continue(self, tokens : Tokens, tabs, loop):
         keyw = tokens.last()
@@ -586,21 +1158,18 @@ class Compiler:
 
         if loop is None:
             self.__error('cannot use "continue" outside of a loop', keyw)
-            return loop
-        elif isinstance(loop, CompLoop) and not loop.comp == "":
-            self.out += (" " * tabs) + loop.comp
-
-        self.out += (" " * tabs) + "continue\n"
+            return
+        elif isinstance(loop, CompLoop):
+            for statement in loop.comp:
+                self.out.line(tabs, statement)
 
-        return loop
+        self.out.line(tabs, "continue")
 
     def __untilEnd(self, keyw):
         def fn(tokens : Tokens, tabs, loop):
             _, val = self.getUntilNotInExpr(";", tokens, True, advance = False)
 
-            self.out += (" " * tabs) + Tokens([Token(keyw)] + val).join() + "\n"
-
-            return loop
+            self.out.line(tabs, Tokens([Token(keyw)] + val).join())
 
         return fn
 
@@ -609,24 +1178,19 @@ class Compiler:
 
         if not self.flags["abstract"]:
             self.flags["abstract"] = True
-            self.headers += "from abc import abstractmethod\nfrom abc import ABC as _ABSTRACT_BASE_CLASS_\n"
-
-        return loop
+            self.headers.line(0, "from abc import abstractmethod")
+            self.headers.line(0, "from abc import ABC as _ABSTRACT_BASE_CLASS_")
 
     def __static(self, tokens: Tokens, tabs, loop):
         self.nextStatic = True
 
-        return loop
-
     def __package(self, tokens : Tokens, tabs, loop):
         _, name = self.getUntilNotInExpr(":", tokens, True, advance = False)
         strName = Tokens(name).join()
 
         self.lastPackage = strName
 
-        self.headers += "from " + strName + " "
-
-        return loop
+        self.headers.write("from ", strName, " ")
 
     def __import(self, tokens : Tokens, tabs, loop):
         keyw = tokens.last()
@@ -635,44 +1199,30 @@ class Compiler:
         if len(imports) == 1 and imports[0].tok == "*":
             if self.lastPackage == "":
                 self.__error('cannot use "import *" if no package is defined', keyw)
-                return loop
+                return
 
             self.lastPackage = ""
-            self.headers += "import *\n"
-
-            return loop
+            self.headers.line(0, "import *")
 
-        self.headers += "import " + Tokens(imports).join() + "\n"
+            return
 
-        return loop
+        self.headers.line(0, "import " + Tokens(imports).join())
 
     def __simpleBlock(self, keyw, kwname, push = None):
         def fn(tokens : Tokens, tabs, loop):
             self.checkDirectNext("{", f'"{kwname}"', tokens)
             block = self.getSameLevelParenthesis("{", "}", tokens)
 
-            self.out += (" " * tabs) + keyw
-
-            if len(block) == 0:
-                self.out += ":pass\n"
-            else:
-                self.out += ":\n"
-
-                if push is None:
-                    loop = self.__compiler(Tokens(block), tabs + 1, loop)[0]
-                else:
-                    self.__nameStack.push(push)
-                    loop = self.__compiler(Tokens(block), tabs + 1, loop)[0]
-                    self.__nameStack.pop()
+            self.out.block(tabs, keyw, len(block) == 0)
 
-            return loop
+            if len(block) != 0:
+                self.__enter(block, tabs + 1, loop, push)
 
         return fn
 
     def __block(self, keyw, inLoop = None, content = None, after = None, push = None):
         def fn(tokens : Tokens, tabs, loop):
-            loopNotDef = inLoop is None
-            if loopNotDef:
+            if inLoop is None:
                 internalLoop = loop
             else:
                 internalLoop = inLoop
@@ -683,27 +1233,18 @@ class Compiler:
 
             block = self.getSameLevelParenthesis("{", "}", tokens)
 
-            self.out += (" " * tabs) + Tokens([Token(keyw)] + localContent).join()
+            header = Tokens([Token(keyw)] + localContent).join()
 
             if after is not None:
-                self.out += ":\n" + (" " * (tabs + 1)) + after + "\n"
+                self.out.block(tabs, header, False)
+                self.out.line(tabs + 1, after)
             else:
-                if len(block) == 0:
-                    self.out += ":pass\n"
-                    return loop
+                self.out.block(tabs, header, len(block) == 0)
 
-                self.out += ":\n"
-
-            if push is None:
-                tmp = self.__compiler(Tokens(block), tabs + 1, internalLoop)[0]
-            else:
-                self.__nameStack.push(push)
-                tmp = self.__compiler(Tokens(block), tabs + 1, internalLoop)[0]
-                self.__nameStack.pop()
-
-            if loopNotDef: loop = tmp
+                if len(block) == 0:
+                    return
 
-            return loop
+            self.__enter(block, tabs + 1, internalLoop, push)
 
         return fn
 
@@ -724,45 +1265,22 @@ class Compiler:
             _, condition = self.getUntilNotInExpr("{", tokens, True, advance = False)
             block = self.getSameLevelParenthesis("{", "}", tokens)
 
-        check = f"if not({Tokens(condition).join()}):break\n"
-
-        self.out += (" " * tabs) + "while True:\n"
-        self.__compiler(Tokens(block), tabs + 1, CompLoop(check))
-        self.out += (" " * (tabs + 1)) + check
-
-        return loop
-
-    def __matchLoop(self, tokens : Tokens, tabs, loop):
-        while tokens.isntFinished():
-            next = tokens.next()
-
-            if next.tok.startswith('"""') or next.tok.startswith("'''"):
-                self.out += next.tok + "\n"
-                continue
-
-            match next.tok:
-                case "case":
-                    loop = self.__block("case")(tokens, tabs + 1, loop)
-                case "default":
-                    loop = self.__simpleBlock("case _", "default")(tokens, tabs + 1, loop)
-                case _:
-                    self.__error('invalid identifier in "match" statement body', next)
+        check = f"if not({Tokens(condition).join()}):break"
 
-        return loop
+        self.out.line(tabs, "while True:")
+        self.__enter(block, tabs + 1, CompLoop([check]), tail = self.out.indent(tabs + 1) + check + "\n")
 
     def __match(self, tokens : Tokens, tabs, loop):
         _, value = self.getUntilNotInExpr("{", tokens, True, advance = False)
         block = self.getSameLevelParenthesis("{", "}", tokens)
 
         if len(block) == 0:
-            return loop
-
-        self.out += (" " * tabs) + Tokens([Token("match")] + value).join() +":\n"
+            return
 
-        self.__matchLoop(Tokens(block), tabs, loop)
+        self.out.line(tabs, Tokens([Token("match")] + value).join() + ":")
+        self.__enter(block, tabs, loop, match = True)
 
-    def __handleAssignmentChain(self, tabs, variablesDef):
-        buf  = ""
+    def __handleAssignmentChain(self, out : Emitter, tabs, variablesDef):
         objs = []
 
         if len(variablesDef) != 0:
@@ -803,7 +1321,7 @@ class Compiler:
                     next, value = self.getUntilNotInExpr(",", variablesDef, True, False)
                     value = Tokens(value).join()
 
-                    buf += (" " * tabs) + name.tok + op + value + "\n"
+                    out.line(tabs, name.tok + op + value)
                 elif next.tok == ",":
                     next = variablesDef.next()
                 else:
@@ -811,73 +1329,120 @@ class Compiler:
 
                 if next == "": break
 
-        return objs[:-1], buf
+        return objs[:-1]
+
+    def __findBody(self, tokens : Tokens):
+        store = tokens.store
+        begin = tokens.offset + tokens.pos
+        end   = tokens.offset + len(tokens.tokens)
+
+        if store is None or store.hasEscapes(begin, end):
+            return None
+
+        i = begin
+        while i < end:
+            text = store.text(i)
+
+            if text == "{":
+                return i
+
+            if text in BRACKETS:
+                partner = store.match[i]
+
+                if i < partner < end:
+                    i = partner + 1
+                    continue
+
+                return None
+
+            i += 1
+
+        return None
+
+    def __untilBody(self, tokens : Tokens, body):
+        if body is None:
+            _, header = self.getUntilNotInExpr("{", tokens, True, advance = False)
+            return header
+
+        header = tokens.tokens[tokens.pos:body - tokens.offset]
+        tokens.pos = body - tokens.offset + 1
+        return header
+
+    def __countHeaderSemicolons(self, tokens : Tokens, body):
+        if body is None:
+            _, header = self.getUntilNotInExpr("{", tokens.copy(), True, False)
+            return [x.tok for x in header].count(";")
+
+        store = tokens.store
+        begin = tokens.offset + tokens.pos
+
+        if begin == body:
+            return 0
+
+        depth = store.depth[begin]
+        count = store.countSemicolons(depth, begin, body)
+
+        if store.text(begin) == "(" and store.match[begin] == body - 1:
+            count += store.countSemicolons(depth + 1, begin, body)
+
+        return count
 
     def __for(self, tokens : Tokens, tabs, loop):
         keyw = tokens.last()
-        cnt = [x.tok for x in self.getUntilNotInExpr("{", tokens.copy(), True)[1]].count(";")
+        body = self.__findBody(tokens)
 
-        match cnt:
+        match self.__countHeaderSemicolons(tokens, body):
             case 2: # C-like for
-                rndBracks = tokens.peek().tok == "("
-                if rndBracks: tokens.next()
+                if tokens.peek().tok == "(":
+                    tokens.next()
+                    header = Tokens(self.getSameLevelParenthesis("(", ")", tokens))
+                    self.checkDirectNext("{", "for loop", tokens)
+                else:
+                    header = tokens
 
-                if tokens.peek().tok == ";": tokens.next()
+                if header.peek().tok == ";": header.next()
                 else:
-                    _, variablesDef = self.getUntilNotInExpr(";", tokens, True, advance = False)
-                    buf = self.__handleAssignmentChain(tabs, variablesDef)
-                    self.out += buf
+                    _, variablesDef = self.getUntilNotInExpr(";", header, True, advance = False)
+                    self.__handleAssignmentChain(self.out, tabs, variablesDef)
 
-                if tokens.peek().tok == ";":
-                    tokens.next()
+                if header.peek().tok == ";":
+                    header.next()
                     condition = [Token("True")]
                 else:
-                    _, condition = self.getUntilNotInExpr(";", tokens, True, advance = False)
+                    _, condition = self.getUntilNotInExpr(";", header, True, advance = False)
                     if len(condition) == 0: condition = [Token("True")]
 
-                if tokens.peek().tok == "{":
-                    tokens.next()
-                    increments = ""
+                if header is tokens:
+                    steps = self.__untilBody(tokens, body)
                 else:
-                    if rndBracks:
-                        _, increments = self.getUntilNotInExpr(")", tokens, True, advance = False)
-                        self.checkDirectNext("{", "for loop", tokens)
-                    else:
-                        _, increments = self.getUntilNotInExpr("{", tokens, True, advance = False)
+                    steps = header.tokens[header.pos:]
 
-                    objNames, increments = self.__handleAssignmentChain(tabs + 1, objNames, increments)
-
-                statement = [Token("while")] + condition
+                increments = Statements()
+                self.__handleAssignmentChain(increments, 0, steps)
+                statement  = [Token("while")] + condition
             case 0: # Python for
                 _, variablesDef = self.getUntilNotInExpr("in", tokens, True, advance = False)
                 variablesDef = Tokens(variablesDef)
 
                 if len(variablesDef.tokens) == 0:
-                    self.__error("no variable defined in for loop")
+                    self.__error("no variable defined in for loop", keyw)
 
-                _, iterable = self.getUntilNotInExpr("{", tokens, True, advance = False)
+                iterable   = self.__untilBody(tokens, body)
                 statement  = [Token("for")] + variablesDef.tokens + [Token("in")] + iterable
-                increments = ""
+                increments = Statements()
             case _:
                 self.__error('invalid syntax: using an unrecognized amount of semicolons in a for loop', keyw)
-                return loop
+                return
 
         block = self.getSameLevelParenthesis("{", "}", tokens)
 
-        self.out += (" " * tabs) + Tokens(statement).join() + ":"
-
-        if len(block) == 0:
-            if increments == "": self.out += "pass\n"
-            else:                self.out += "\n" + increments
-
-            return loop
+        tail = Emitter()
+        tail.source = self.out.source
+        for increment in increments:
+            tail.line(tabs + 1, increment)
 
-        self.out += "\n"
-        self.__compiler(Tokens(block), tabs + 1, CompLoop(increments.lstrip()))
-
-        if increments != "": self.out += increments
-
-        return loop
+        self.out.block(tabs, Tokens(statement).join(), len(block) == 0 and len(increments) == 0)
+        self.__enter(block, tabs + 1, CompLoop(increments), tail = tail.getvalue())
 
     def __enum(self, tokens : Tokens, tabs, loop):
         _, value = self.getUntilNotInExpr("{", tokens, True, advance = False)
@@ -885,27 +1450,26 @@ class Compiler:
 
         if len(value) == 0:
             if len(block) == 0:
-                return loop
+                return
 
             inTabs = tabs
         else:
             if len(value) > 1:
                 self.__error('enum name should contain only one token', value[0])
 
-            self.out += (" " * tabs) + Tokens([Token("class"), value[0]]).join() + ":"
+            self.out.block(tabs, Tokens([Token("class"), value[0]]).join(), len(block) == 0)
 
             if len(block) == 0:
-                self.out += "pass\n"
-                return loop
-
-            self.out += "\n"
+                return
 
             inTabs = tabs + 1
 
-        objs, assignments = self.__handleAssignmentChain(inTabs, block, False)
-        self.out += (" " * inTabs) + Tokens(objs).join() + f"=range({str(len([x for x in objs if x.tok != ',']))})\n" + assignments
+        assignments = Emitter()
+        assignments.source = self.out.source
 
-        return loop
+        objs = self.__handleAssignmentChain(assignments, inTabs, block)
+        self.out.line(inTabs, Tokens(objs).join() + f"=range({str(len([x for x in objs if x.tok != ',']))})")
+        self.out.extend(assignments)
 
     def __dbGen(self, flag, command, name):
         def __fn(tokens: Tokens, tabs, loop):
@@ -914,21 +1478,14 @@ class Compiler:
 
             if not self.flags[flag]:
                 self.flags[flag] = True
-                self.headers += command + "\n"
+                self.headers.line(0, command)
 
-            self.out += (" " * tabs) + Tokens([Token(f"with {name}(")] + content + [Token(")as db")]).join()
+            self.out.block(tabs, Tokens([Token(f"with {name}(")] + content + [Token(")as db")]).join(), len(block) == 0)
 
             if len(block) == 0:
-                self.out += ":pass\n"
-                return loop
-
-            self.out += ":\n"
-
-            self.__nameStack.push((None, "db"))
-            self.__compiler(Tokens(block), tabs + 1, loop)[0]
-            self.__nameStack.pop()
+                return
 
-            return loop
+            self.__enter(block, tabs + 1, loop, (None, "db"))
         return __fn
 
     def __query(self, tokens : Tokens, tabs, loop):
@@ -946,11 +1503,36 @@ class Compiler:
         if not self.__nameStack.lookfor("db"):
             self.__error('"query" statement cannot be used outside of a DB block', kw)
 
-        self.out += (" " * tabs) + resultIn + Tokens(
-            [Token("db.execute(f'"), Token(encode(Tokens(block).join())), Token("',")] + content + [Token(")")]
-        ).join() + "\n"
+        self.out.line(tabs, resultIn + Tokens(
+            [Token("db.execute("), Token(encode(Tokens(block).join())), Token(",")] + content + [Token(")")]
+        ).join())
+
+    def __literal(self, tokens):
+        if len(tokens) == 0 or any(token.tok[-1] not in QUOTES for token in tokens):
+            return None
+
+        try:
+            node = ast.parse(Tokens(tokens).join(), mode = "eval").body
+        except SyntaxError:
+            return None
+
+        match node:
+            case ast.Constant(value = str()):
+                return node.value
+            case ast.JoinedStr() if all(isinstance(value, ast.Constant) for value in node.values):
+                return "".join(value.value for value in node.values)
+
+        return None
+
+    def __echo(self, tokens : Tokens, tabs, loop):
+        _, val = self.getUntilNotInExpr(";", tokens, True, advance = False)
+        value = self.__literal(val)
 
-        return loop
+        if value is None:
+            self.__flush()
+            self.out.line(tabs, self.__render[3].format(Tokens(val).join()))
+        else:
+            self.static(value, tabs)
 
     def __terminate(self, tokens: Tokens, tabs, loop):
         keyw = tokens.last()
@@ -962,12 +1544,16 @@ class Compiler:
             self.__error('expecting ";" after "terminate"', next)
         else: tokens.next()
 
-        self.out += (" " * tabs) + "return _HTML_BUF\n"
-
-        return loop
+        self.out.line(tabs, "return " + self.__render[2])
 
-    def __init__(self):
+    def __init__(self, fusion = False, hoist = False, production = False, profile = False, asynchronous = False, streaming = False, buffer = "str"):
         self.__entryPoint = -1
+        self.fusion       = fusion
+        self.hoist        = hoist
+        self.production   = production
+        self.asynchronous = asynchronous
+        self.streaming    = streaming
+        self.buffer       = buffer
 
         self.reset()
 
@@ -1004,25 +1590,76 @@ class Compiler:
             "MySQL":     self.__dbGen('mysql', 'from MySQL import MySQL', 'MySQL'),
             "MonQi":     self.__dbGen('monqi', 'from MonQi import MonQi', 'MonQi'),
             "query":     self.__query,
-            "echo":      self.__untilEnd("_HTML_BUF+="),
+            "echo":      self.__echo,
             "reply":     self.__untilEnd("return"),
             "terminate": self.__terminate
         }
 
+        self.matchHandlers = {
+            "case":    self.__block("case"),
+            "default": self.__simpleBlock("case _", "default")
+        }
+
+        self.profiler = None
+        if profile:
+            self.profile(Profiler())
+
+    def profile(self, profiler):
+        self.profiler = profiler
+
+        for handlers in (self.statementHandlers, self.matchHandlers):
+            for keyword, handler in handlers.items():
+                handlers[keyword] = profiler.wrap(keyword, handler)
+
+        self.compile                 = profiler.wrap("compile", self.compile)
+        self.getUntilNotInExpr       = profiler.wrap("getUntilNotInExpr", self.getUntilNotInExpr)
+        self.getSameLevelParenthesis = profiler.wrap("getSameLevelParenthesis", self.getSameLevelParenthesis)
+
     def __error(self, msg, token : Token):
         self.hadError = True
-        token.error(msg)
+
+        if self.production:
+            self.diagnostics.append(Diagnostic("error", token, msg))
+        else:
+            token.error(msg)
 
     def __warning(self, msg, token : Token):
-        token.warning(msg)
+        if self.production:
+            self.diagnostics.append(Diagnostic("warning", token, msg))
+        else:
+            token.warning(msg)
+
+    def render(self):
+        for diagnostic in self.diagnostics:
+            diagnostic.render()
+
+    @property
+    def __render(self):
+        if self.streaming:
+            return RENDER_BUFFERS["str"]
 
-    def reset(self):
-        self.__entryPoint += 1
-        self.headers = ""
-        self.out     = f"def qinpEntryPoint{self.__entryPoint}(*args,**kwargs):\n _HTML_BUF="
-        self.__nameStack = NameStack()
+        return RENDER_BUFFERS[self.buffer]
 
-        self.hadError = False
+    @property
+    def entry(self):
+        return f"qinpEntryPoint{self.__entryPoint}"
+
+    def reset(self, entryPoint = None):
+        if entryPoint is None:
+            self.__entryPoint += 1
+        else:
+            self.__entryPoint = entryPoint
+
+        self.headers = Emitter()
+        self.out     = Emitter(f"def {self.entry}(*args,**kwargs):\n")
+        self.__nameStack  = NameStack()
+        self.__lineOffset = 0
+        self.__staticBuf  = [""]
+        self.__staticTabs = 1
+        self.__assigned   = False
+
+        self.hadError    = False
+        self.diagnostics = []
         self.flags = {
             "abstract": False,
             "markup": False,
@@ -1046,26 +1683,74 @@ class Compiler:
         return next
 
     def getUntil(self, ch, tokens : Tokens, buffer = False):
-        buf = []
+        begin = tokens.pos
+        buf   = None
         while tokens.isntFinished():
             next = tokens.next()
 
             if next.tok == "\\":
+                if buf is None: buf = list(tokens.tokens[begin:tokens.pos - 1])
                 tokens.next()
                 continue
 
             if next.tok == ch:
-                if buffer: return next, buf
+                if buffer: return next, tokens.tokens[begin:tokens.pos - 1] if buf is None else buf
                 else:      return next
 
-            buf.append(next)
+            if buf is not None: buf.append(next)
 
         self.__error(f'expecting character "{ch}"', next)
 
-        if buffer: return "", buf
+        if buffer: return "", tokens.tokens[begin:tokens.pos] if buf is None else buf
+        else:      return ""
+
+    def __getUntilIndexed(self, ch, tokens : Tokens, buffer, errorNotFound, advance):
+        store  = tokens.store
+        offset = tokens.offset
+        begin  = tokens.pos
+        end    = offset + len(tokens.tokens)
+        i      = offset + begin
+
+        while i < end:
+            text = store.text(i)
+
+            if text == ch:
+                tokens.pos = i - offset + 1
+                next = tokens.last()
+
+                if advance and tokens.isntFinished():
+                    next = tokens.next()
+
+                if buffer: return next, tokens.tokens[begin:i - offset]
+                else:      return next
+
+            if text in BRACKETS and not (ch == "{" and text in "{}"):
+                partner = store.match[i]
+
+                if i < partner < end:
+                    i = partner + 1
+                    continue
+
+                self.__error(f"unbalanced brackets {BRACKETS[text]}", store[i])
+                break
+
+            i += 1
+
+        tokens.pos = len(tokens.tokens)
+
+        if errorNotFound:
+            if tokens.pos == 0:
+                self.__error(f'expecting character "{ch}"', Token(""))
+            else:
+                self.__error(f'expecting character "{ch}"', tokens.last())
+
+        if buffer: return "", tokens.tokens[begin:]
         else:      return ""
 
     def getUntilNotInExpr(self, ch, tokens : Tokens, buffer = False, errorNotFound = True, advance = True, unallowed = []):
+        if tokens.store is not None and len(unallowed) == 0 and not tokens.store.hasEscapes(tokens.offset + tokens.pos, tokens.offset + len(tokens.tokens)):
+            return self.__getUntilIndexed(ch, tokens, buffer, errorNotFound, advance)
+
         rdBrack = 0
         sqBrack = 0
         crBrack = 0
@@ -1074,7 +1759,8 @@ class Compiler:
         lastCrBrack = tokens.peek()
         next = tokens.peek()
 
-        buf = []
+        begin = tokens.pos
+        buf   = None # only built when an escape makes the tokens non-contiguous
         while tokens.isntFinished():
             next = tokens.next()
 
@@ -1100,6 +1786,8 @@ class Compiler:
                         lastCrBrack = next
                         crBrack -= 1
                 case "\\":
+                    if buf is None: buf = list(tokens.tokens[begin:tokens.pos - 1])
+
                     if tokens.isntFinished():
                         next = tokens.next()
                     else:
@@ -1111,6 +1799,8 @@ class Compiler:
                     continue
 
             if next.tok in unallowed:
+                if buf is None: buf = tokens.tokens[begin:tokens.pos - 1]
+
                 if advance and tokens.isntFinished():
                     next = tokens.next()
 
@@ -1119,13 +1809,17 @@ class Compiler:
 
             if rdBrack == 0 and sqBrack == 0 and crBrack == 0:
                 if next.tok == ch:
+                    if buf is None: buf = tokens.tokens[begin:tokens.pos - 1]
+
                     if advance and tokens.isntFinished():
                         next = tokens.next()
 
                     if buffer: return next, buf
                     else:      return next
 
-            buf.append(next)
+            if buf is not None: buf.append(next)
+
+        if buf is None: buf = tokens.tokens[begin:tokens.pos]
 
         if rdBrack != 0:
             if lastRdBrack is None:
@@ -1156,12 +1850,24 @@ class Compiler:
 
     def getSameLevelParenthesis(self, openCh, closeCh, tokens : Tokens):
         pCount = 1
-        buf = []
+        begin  = tokens.pos
         lastParen = tokens.peek()
         if lastParen is None:
             self.__error('unbalanced parenthesis "' + openCh + closeCh + '"', tokens.tokens[-1])
             return []
 
+        if tokens.store is not None and begin > 0 and tokens.store.text(tokens.offset + begin - 1) == openCh:
+            opener = tokens.offset + begin - 1
+            closer = tokens.store.match[opener]
+
+            if opener < closer < tokens.offset + len(tokens.tokens):
+                tokens.pos = closer - tokens.offset + 1
+                return tokens.tokens[begin:tokens.pos - 1]
+
+            self.__error('unbalanced parenthesis "' + openCh + closeCh + '"', tokens.last())
+            tokens.pos = len(tokens.tokens)
+            return tokens.tokens[begin:]
+
         while tokens.isntFinished():
             next = tokens.next()
 
@@ -1173,12 +1879,10 @@ class Compiler:
                 pCount -= 1
 
             if pCount == 0:
-                return buf
-
-            buf.append(next)
+                return tokens.tokens[begin:tokens.pos - 1]
 
         self.__error('unbalanced parenthesis "' + openCh + closeCh + '"', lastParen)
-        return buf
+        return tokens.tokens[begin:tokens.pos]
 
     def __handleFn(self, tokens: Tokens, tabs, name, op, msg, loop):
         next = tokens.peek()
@@ -1211,7 +1915,7 @@ class Compiler:
                 if notInClass:
                     self.__error("cannot create abstract method outside of a class", name)
                 else:
-                    self.out += (" " * tabs) + "@abstractmethod\n"
+                    self.out.line(tabs, "@abstractmethod")
 
             if self.nextStatic:
                 self.nextStatic = False
@@ -1219,7 +1923,7 @@ class Compiler:
                 if notInClass:
                     self.__error("cannot create static method outside of a class", name)
                 else:
-                    self.out += (" " * tabs) + "@classmethod\n"
+                    self.out.line(tabs, "@classmethod")
 
             if next is None:
                 self.__error('invalid syntax: expecting "{"')
@@ -1227,27 +1931,68 @@ class Compiler:
 
             block = self.getSameLevelParenthesis("{", "}", tokens)
 
-            self.out += (" " * tabs) + "def " + op + f"({argsString}):"
+            self.out.block(tabs, "def " + op + f"({argsString})", len(block) == 0)
 
             if len(block) == 0:
-                self.out += "pass\n"
                 return
 
-            self.out += "\n" + (" " * (tabs + 1)) + "nonlocal _HTML_BUF\n"
-            self.__nameStack.push((name.tok, "fn"))
-            self.__compiler(Tokens(block), tabs + 1, loop)
-            self.__nameStack.pop()
+            self.out.line(tabs + 1, "nonlocal _HTML_BUF")
+            self.__enter(block, tabs + 1, loop, (name.tok, "fn"))
+
+    def __enter(self, block, tabs, loop, scope = None, tail = "", match = False):
+        if tabs >= MAX_INDENT and len(block) != 0:
+            self.__error(f"blocks cannot be nested more than {MAX_INDENT - 2} levels deep", block[0])
+            return
+
+        if scope is not None:
+            self.__nameStack.push(scope)
+
+        owner = None if self.profiler is None else self.profiler.claim()
+        self.__frames.append(Frame(Tokens(block), tabs, loop, scope, tail, match, owner))
 
     def __compiler(self, tokens : Tokens, tabs, loop):
-        while tokens.isntFinished():
+        frames = self.__frames = [Frame(tokens, tabs, loop)]
+
+        while len(frames) != 0:
+            frame  = frames[-1]
+            tokens = frame.tokens
+
+            if not tokens.isntFinished():
+                frames.pop()
+
+                if frame.scope is not None:
+                    self.__nameStack.pop()
+
+                if frame.tail != "":
+                    self.__flush()
+                    self.out.write(frame.tail)
+
+                if frame.owner is not None:
+                    self.profiler.close(frame.owner)
+
+                continue
+
+            tabs = frame.tabs
+            loop = frame.loop
             next = tokens.next()
 
+            self.out.source     = self.__lineOffset + next.line
+            self.headers.source = self.out.source
+
+            if next.tok != "echo":
+                self.__flush()
+
             if next.tok.startswith('"""') or next.tok.startswith("'''"):
-                self.out += next.tok + "\n"
+                self.out.write(next.tok, "\n")
                 continue
 
-            if next.tok in self.statementHandlers:
-                loop = self.statementHandlers[next.tok](tokens, tabs, loop)
+            if frame.match:
+                if next.tok in self.matchHandlers:
+                    self.matchHandlers[next.tok](tokens, tabs + 1, loop)
+                else:
+                    self.__error('invalid identifier in "match" statement body', next)
+            elif next.tok in self.statementHandlers:
+                self.statementHandlers[next.tok](tokens, tabs, loop)
             else:
                 name = next
                 next = tokens.peek()
@@ -1277,7 +2022,7 @@ class Compiler:
                                     if not inClass:
                                         self.__error("cannot create abstract method outside of a class", name)
                                     else:
-                                        self.out += (" " * tabs) + "@abstractmethod\n"
+                                        self.out.line(tabs, "@abstractmethod")
 
                                 if self.nextStatic:
                                     self.nextStatic = False
@@ -1285,7 +2030,7 @@ class Compiler:
                                     if not inClass:
                                         self.__error("cannot create static method outside of a class", name)
                                     else:
-                                        self.out += (" " * tabs) + "@classmethod\n"
+                                        self.out.line(tabs, "@classmethod")
 
                                 if next is None:
                                     self.__error('invalid syntax: expecting "{"')
@@ -1293,20 +2038,17 @@ class Compiler:
 
                                 block = self.getSameLevelParenthesis("{", "}", tokens)
 
-                                self.out += (" " * tabs) + "def " + name.tok + f"({argsString}):"
+                                self.out.block(tabs, "def " + name.tok + f"({argsString})", len(block) == 0)
 
                                 if len(block) == 0:
-                                    self.out += "pass\n"
                                     continue
 
-                                self.out += "\n" + (" " * (tabs + 1)) + "nonlocal _HTML_BUF\n"
-                                self.__nameStack.push((name.tok, "fn"))
-                                self.__compiler(Tokens(block), tabs + 1, loop)
-                                self.__nameStack.pop()
+                                self.out.line(tabs + 1, "nonlocal _HTML_BUF")
+                                self.__enter(block, tabs + 1, loop, (name.tok, "fn"))
                             else: # function call
                                 tokens.pos = backpos - 1
                                 _, expr = self.getUntilNotInExpr(";", tokens, True, advance = False)
-                                self.out += (" " * tabs) + Tokens(expr).join() + "\n"
+                                self.out.line(tabs, Tokens(expr).join())
                         case "!": # magic method definition
                             tokens.next()
 
@@ -1343,24 +2085,442 @@ class Compiler:
                         case _: # assignment
                             tokens.pos -= 1
                             _, expr = self.getUntilNotInExpr(";", tokens, True, advance = False)
-                            self.out += (" " * tabs) + Tokens(expr).join() + "\n"
+                            self.out.line(tabs, Tokens(expr).join())
                 else:
                     self.__error("unknown statement or identifier", name)
 
-        return loop, tabs
-
     def readFile(self, fileName, rep = False):
         with open(fileName, "r") as txt:
             content = txt.read()
         return content.replace("\t", " " if rep else "")
 
-    def compile(self, section):
+    def __flush(self):
+        if len(self.__staticBuf) == 0:
+            return
+
+        text = "".join(self.__staticBuf)
+        self.__staticBuf.clear()
+
+        if not self.__assigned:
+            self.__assigned = True
+            self.out.line(self.__staticTabs, self.__render[0].format(encode(text)))
+
+            if self.__render is RENDER_BUFFERS["io"]:
+                self.headers.line(0, "from io import StringIO as _QINP_StringIO")
+        elif text != "":
+            self.out.line(self.__staticTabs, self.__render[1].format(encode(text)))
+
+    def static(self, text, tabs = 1):
+        if tabs != self.__staticTabs:
+            self.__flush()
+            self.__staticTabs = tabs
+
+        self.__staticBuf.append(text)
+
+    def finish(self):
+        self.__flush()
+        self.out.line(1, "return " + self.__render[2])
+
+    def compile(self, section, line = 1):
         self.nextAbstract = False
         self.nextStatic   = False
         self.lastPackage  = ""
-        self.lastTabs     = 1
+        self.__lineOffset = line - 1
+
+        if self.profiler is None:
+            self.__compiler(Tokens(section), 1, None)
+        else:
+            with self.profiler:
+                self.__compiler(Tokens(section), 1, None)
+
+    def unit(self, section, line = 1):
+        state = (
+            self.headers, self.out, self.__staticBuf, self.__staticTabs,
+            self.__assigned, self.flags, self.hadError, self.diagnostics
+        )
+
+        self.headers      = Emitter()
+        self.out          = Emitter()
+        self.__staticBuf  = []
+        self.__staticTabs = 1
+        self.__assigned   = True
+        self.flags        = dict.fromkeys(self.flags, False)
+        self.hadError     = False
+        self.diagnostics  = []
+
+        self.compile(section, line)
+        self.__flush()
+
+        result = Unit(self.headers, self.out, self.diagnostics, self.hadError, line)
+
+        (
+            self.headers, self.out, self.__staticBuf, self.__staticTabs,
+            self.__assigned, self.flags, self.hadError, self.diagnostics
+        ) = state
+
+        return result
+
+    def link(self, unit, line = None):
+        delta = 0 if line is None else line - unit.line
+
+        self.__flush()
+        self.headers.extend(unit.headers, delta)
+        self.out.extend(unit.out, delta)
+        self.diagnostics.extend(unit.diagnostics)
+        self.hadError = self.hadError or unit.hadError
+
+    def __findEntry(self, tree):
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name == self.entry:
+                return node
+
+        return None
+
+    def __bindings(self, node):
+        names = set()
+
+        for child in ast.walk(node):
+            match child:
+                case ast.Name(ctx = ast.Store() | ast.Del()):
+                    names.add(child.id)
+                case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.ClassDef():
+                    names.add(child.name)
+                case ast.alias():
+                    names.add((child.name if child.asname is None else child.asname).split(".")[0])
+                case ast.ExceptHandler(name = str()) | ast.MatchAs(name = str()) | ast.MatchStar(name = str()):
+                    names.add(child.name)
+                case ast.MatchMapping(rest = str()):
+                    names.add(child.rest)
+                case ast.arg():
+                    names.add(child.arg)
+
+        return names
+
+    def __references(self, node):
+        names = set()
+
+        for child in ast.walk(node):
+            match child:
+                case ast.Name():
+                    names.add(child.id)
+                case ast.Nonlocal():
+                    names.update(name for name in child.names if name != "_HTML_BUF")
+
+        return names
+
+    def __detach(self, node):
+        for child in ast.walk(node):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+
+            body = []
+            for statement in child.body:
+                if isinstance(statement, ast.Nonlocal):
+                    statement.names = [name for name in statement.names if name != "_HTML_BUF"]
+
+                    if len(statement.names) == 0:
+                        continue
+
+                body.append(statement)
+
+            if len(body) == 0:
+                body.append(ast.copy_location(ast.Pass(), child))
+
+            child.body = body
+
+    def __definitionTime(self, node):
+        match node:
+            case ast.FunctionDef() | ast.AsyncFunctionDef():
+                args  = node.args
+                nodes = node.decorator_list + args.defaults + [default for default in args.kw_defaults if default is not None]
+                nodes.extend(
+                    arg.annotation for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+                    if arg is not None and arg.annotation is not None
+                )
+
+                if node.returns is not None:
+                    nodes.append(node.returns)
+
+                return nodes
+            case ast.ClassDef():
+                nodes = node.decorator_list + node.bases + [keyword.value for keyword in node.keywords]
+
+                for statement in node.body:
+                    if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        nodes.extend(self.__definitionTime(statement))
+                    else:
+                        nodes.append(statement)
+
+                return nodes
+
+        return [node]
+
+    def __constant(self, node):
+        match node:
+            case ast.Constant() | ast.Name(ctx = ast.Load()):
+                return True
+            case ast.Attribute(ctx = ast.Load()):
+                return self.__constant(node.value)
+            case ast.Subscript(ctx = ast.Load()):
+                return self.__constant(node.value) and self.__constant(node.slice)
+            case ast.Tuple(ctx = ast.Load()):
+                return all(self.__constant(element) for element in node.elts)
+            case ast.UnaryOp():
+                return self.__constant(node.operand)
+            case ast.BinOp():
+                return self.__constant(node.left) and self.__constant(node.right)
+            case ast.BoolOp():
+                return all(self.__constant(value) for value in node.values)
+            case ast.Compare():
+                return self.__constant(node.left) and all(self.__constant(value) for value in node.comparators)
+
+        return False
+
+    def __pure(self, node):
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Name) and decorator.id in PURE_DECORATORS):
+                return False
+
+        if not isinstance(node, ast.ClassDef):
+            return all(self.__constant(child) for child in self.__definitionTime(node)[len(node.decorator_list):])
+
+        if not all(self.__constant(child) for child in node.bases + [keyword.value for keyword in node.keywords]):
+            return False
+
+        for statement in node.body:
+            match statement:
+                case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.ClassDef():
+                    pure = self.__pure(statement)
+                case ast.Assign():
+                    pure = all(isinstance(target, ast.Name) for target in statement.targets) and self.__constant(statement.value)
+                case ast.AnnAssign(target = ast.Name()):
+                    pure = self.__constant(statement.annotation) and (statement.value is None or self.__constant(statement.value))
+                case ast.Expr(value = ast.Constant()) | ast.Pass():
+                    pure = True
+                case _:
+                    pure = False
+
+            if not pure:
+                return False
+
+        for child in ast.walk(node):
+            match child:
+                case ast.Attribute(value = ast.Call(func = ast.Name(id = "type")) | ast.Attribute(attr = "__class__"), ctx = ast.Store() | ast.Del()):
+                    return False
+
+        return True
+
+    def __mutated(self, tree):
+        names = set()
+
+        for child in ast.walk(tree):
+            match child:
+                case ast.Attribute(value = ast.Name(), ctx = ast.Store() | ast.Del()):
+                    names.add(child.value.id)
+                case ast.Call(func = ast.Name(id = "setattr" | "delattr"), args = [ast.Name(), *_]):
+                    names.add(child.args[0].id)
+
+        return names
+
+    def __definitionReferences(self, node):
+        names = set()
+        local = set()
+
+        for child in self.__definitionTime(node):
+            names |= self.__references(child)
+            local |= self.__bindings(child)
 
-        self.lastTabs = self.__compiler(Tokens(section), 1, None)[1]
+        if isinstance(node, ast.ClassDef):
+            local.update(
+                statement.name for statement in node.body
+                if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            )
+
+        return names - local
+
+    def __hoist(self, tree, entry):
+        definitions = [node for node in entry.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+        bound       = {"_HTML_BUF"} | self.__bindings(entry.args)
+        module      = set(dir(builtins))
+
+        for node in tree.body[:tree.body.index(entry)]:
+            module |= self.__bindings(node)
+
+        for node in entry.body:
+            if node not in definitions:
+                bound |= self.__bindings(node)
+
+        names   = [node.name for node in definitions]
+        mutated = self.__mutated(tree)
+        hoisted = [
+            node for node in definitions
+            if names.count(node.name) == 1 and node.name not in bound and node.name not in mutated and self.__pure(node)
+        ]
+        bound.update(names)
+        bound.difference_update(node.name for node in hoisted)
+
+        definitionTime = {node.name: self.__definitionReferences(node) - module for node in hoisted}
+
+        changed = True
+        while changed:
+            changed   = False
+            available = {node.name for node in hoisted}
+
+            for node in hoisted.copy():
+                if not (self.__references(node).isdisjoint(bound) and definitionTime[node.name] <= available):
+                    hoisted.remove(node)
+                    bound.add(node.name)
+                    changed = True
+
+        if len(hoisted) == 0:
+            return
+
+        for node in hoisted:
+            self.__detach(node)
+
+        entry.body = [node for node in entry.body if node not in hoisted]
+
+        index = tree.body.index(entry)
+        tree.body[index:index] = hoisted
+
+    def __fuse(self, node):
+        match node.body[0]:
+            case ast.Assign(targets = [ast.Name(id = "_HTML_BUF")], value = ast.List(elts = [value])):
+                parts = [value]
+            case ast.Assign(targets = [ast.Name(id = "_HTML_BUF")], value = ast.Call(func = ast.Name(id = "_QINP_StringIO"), args = [])):
+                parts = []
+            case ast.Assign(targets = [ast.Name(id = "_HTML_BUF")]):
+                parts = [node.body[0].value]
+            case _:
+                return
+
+        echo = None
+        for statement in node.body[1:-1]:
+            match statement:
+                case ast.Assign(targets = [ast.Name(id = "_QINP_ECHO")]) if echo is None:
+                    echo = statement.value
+                case ast.AugAssign(target = ast.Name(id = "_HTML_BUF"), op = ast.Add(), value = ast.Name(id = "_QINP_ECHO")) if echo is not None:
+                    parts.append(echo)
+                    echo = None
+                case ast.AugAssign(target = ast.Name(id = "_HTML_BUF"), op = ast.Add()) if echo is None:
+                    parts.append(statement.value)
+                case ast.Expr(value = ast.Call(func = ast.Attribute(value = ast.Name(id = "_HTML_BUF"), attr = "append" | "write"), args = [value], keywords = [])) if echo is None:
+                    parts.append(value)
+                case _:
+                    return
+
+        if echo is not None:
+            return
+
+        match node.body[-1]:
+            case ast.Return(value = ast.Name(id = "_HTML_BUF")):
+                pass
+            case ast.Return(value = ast.Call(func = ast.Attribute(value = ast.Constant(value = ""), attr = "join"), args = [ast.Name(id = "_HTML_BUF")])):
+                pass
+            case ast.Return(value = ast.Call(func = ast.Attribute(value = ast.Name(id = "_HTML_BUF"), attr = "getvalue"), args = [])):
+                pass
+            case _:
+                return
+
+        for part in parts:
+            for child in ast.walk(part):
+                if isinstance(child, ast.Name) and child.id == "_HTML_BUF":
+                    return
+
+        if len(parts) == 1:
+            result = parts[0]
+        else:
+            result = ast.Call(ast.Attribute(ast.Constant(""), "join", ast.Load()), [ast.Tuple(parts, ast.Load())], [])
+
+        node.body = [ast.copy_location(ast.Return(result), node.body[-1])]
+        ast.fix_missing_locations(node)
+
+    def __awaits(self, node):
+        for child in self.__entryLevel(node):
+            if isinstance(child, (ast.Await, ast.AsyncFor, ast.AsyncWith)):
+                return True
+
+        return False
+
+    def __entryLevel(self, node):
+        stack = list(node.body)
+
+        while len(stack) != 0:
+            child = stack.pop()
+
+            match child:
+                case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.Lambda() | ast.ClassDef():
+                    continue
+
+            yield child
+            stack.extend(ast.iter_child_nodes(child))
+
+    def __stream(self, entry):
+        for child in self.__entryLevel(entry):
+            match child:
+                case ast.Return(value = ast.Name(id = "_HTML_BUF")):
+                    pass
+                case ast.Return() | ast.Yield() | ast.YieldFrom():
+                    return
+
+        drain = False
+        for child in ast.walk(entry):
+            if isinstance(child, ast.Nonlocal) and "_HTML_BUF" in child.names:
+                drain = True
+                break
+
+        Streamer(drain).stream(entry)
+
+    def __makeAsync(self, tree, entry):
+        node  = ast.AsyncFunctionDef(**{field: getattr(entry, field, None) for field in entry._fields})
+        index = tree.body.index(entry)
+        tree.body[index] = ast.copy_location(node, entry)
+
+    def sourceLine(self, lineno):
+        return sourceLine(self.headers.lines + self.out.lines, lineno)
+
+    def syntaxError(self, error : SyntaxError, source):
+        self.hadError = True
+        diagnostic    = Diagnostic.atLine("error", source, self.sourceLine(error.lineno or 0), error.msg)
+
+        if self.production:
+            self.diagnostics.append(diagnostic)
+        else:
+            diagnostic.render()
+
+    def build(self, fileName):
+        source = self.headers.getvalue() + self.out.getvalue()
+        lines  = self.headers.lines + self.out.lines
+
+        if not (self.fusion or self.hoist or self.asynchronous or self.streaming):
+            if sys.version_info < (3, 11):
+                return compile(remapTree(ast.parse(source, fileName), lines), fileName, "exec")
+
+            return remapLines(compile(source, fileName, "exec"), lines)
+
+        tree  = ast.parse(source, fileName)
+        entry = self.__findEntry(tree)
+
+        if entry is not None and self.hoist:
+            self.__hoist(tree, entry)
+
+        if entry is not None and self.streaming:
+            self.__stream(entry)
+
+        if entry is not None and self.fusion:
+            self.__fuse(entry)
+
+        if entry is not None and self.asynchronous and self.__awaits(entry):
+            self.__makeAsync(tree, entry)
+
+        if sys.version_info < (3, 11):
+            return compile(remapTree(tree, lines), fileName, "exec")
+
+        return remapLines(compile(tree, fileName, "exec"), lines)
 
 if __name__ == "__main__":
-    print("qinp! compiler v2023.4.19\nThis file is not meant to be ran.")
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        from pinq import buildPages
+        sys.exit(buildPages(*sys.argv[2:3]))
+
+    print(f"qinp! compiler v{VERSION}\nThis file is not meant to be ran.")
\ No newline at end of file